@@ -0,0 +1,67 @@
+"""
+Tiempo de importación del paquete y dependencias pesadas cargadas al importarlo.
+
+Cada medición se hace en un proceso nuevo de Python (sin módulos en memoria).
+Se mide `import paq_Datos_SLC` y `from paq_Datos_SLC import DATA`, y se verifica
+que ninguno de los dos cargue astroquery, astropy, pandas, requests ni aiohttp
+(se importan recién en las funciones que los usan). Termina con código 1 si
+se supera el presupuesto de tiempo o si se carga alguna de esas dependencias.
+
+Uso:
+    python benchmarks/bench_import.py --budget 0.5
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY = ("astroquery", "astropy", "pandas", "requests", "aiohttp")
+
+CASES = {
+    "import paq_Datos_SLC": "import paq_Datos_SLC",
+    "from paq_Datos_SLC import DATA": "from paq_Datos_SLC import DATA; DATA()",
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - t0
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement, repeat):
+    # Mejor tiempo de `repeat` procesos nuevos
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY)],
+                             check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="segundos máximos para `from paq_Datos_SLC import DATA` (por defecto 0.5)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for name, statement in CASES.items():
+        result = measure(statement, args.repeat)
+        print(f"{name:<34} {result['seconds']:.3f} s  pesadas={result['heavy'] or '-'}")
+        if result["heavy"]:
+            print(f"  ERROR: se importaron {', '.join(result['heavy'])}")
+            failed = True
+        if result["seconds"] > args.budget:
+            print(f"  ERROR: supera el presupuesto de {args.budget:.3f} s")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
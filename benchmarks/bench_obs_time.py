@@ -0,0 +1,63 @@
+"""
+Benchmark de la conversión de fechas de observación (obsTime) del MPC.
+
+Compara la versión fila a fila (`DATA._parse_obs_time` con `apply`) contra la
+versión vectorizada (`DATA._parse_obs_times`) sobre una columna sintética con
+fechas ISO y de día fraccionado, y verifica que ambas den el mismo resultado.
+
+Uso:
+    python benchmarks/bench_obs_time.py --rows 200000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import polars as pl
+
+from paq_Datos_SLC import DATA
+
+
+def make_obs_times(n_rows, seed=0):
+    # Mezcla de formatos como los que devuelve el MPC (ISO con Z y día fraccionado)
+    rnd = random.Random(seed)
+    t0 = datetime(1990, 1, 1)
+    values = []
+    for i in range(n_rows):
+        t = t0 + timedelta(minutes=rnd.randint(0, 30 * 365 * 24 * 60))
+        if i % 7 == 0:
+            values.append(t.strftime("%Y-%m-%d") + f".{rnd.randint(0, 99999):05d}")
+        else:
+            values.append(t.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z")
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    mpc = DATA()
+    values = make_obs_times(args.rows)
+
+    t0 = time.perf_counter()
+    legacy = pd.Series(values).apply(mpc._parse_obs_time)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    vectorized = pl.DataFrame({"obsTime": values}).select(mpc._parse_obs_times("obsTime"))["obsTime"]
+    t_vectorized = time.perf_counter() - t0
+
+    # Diferencias de más de 1 ms entre ambas versiones (redondeo de la fracción de día)
+    legacy_us = pl.Series(pd.to_datetime(legacy, utc=True)).dt.epoch("us")
+    mismatches = ((legacy_us - vectorized.dt.epoch("us")).abs() > 1000).sum()
+
+    print(f"filas:          {args.rows}")
+    print(f"fila a fila:    {t_legacy:.3f} s")
+    print(f"vectorizado:    {t_vectorized:.3f} s  (x{t_legacy / t_vectorized:.1f})")
+    print(f"diferencias:    {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
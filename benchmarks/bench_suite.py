@@ -0,0 +1,292 @@
+"""
+Benchmarks de las etapas de descarga y procesamiento, sin conexión a internet.
+
+Reproduce respuestas del MPC (XML), Horizons y COBS (JSON) de varios tamaños
+a través de un transporte local que reemplaza a la red, y mide el tiempo y la
+memoria máxima de:
+
+- observations_MPC_raw (pandas) y observations_MPC (Polars)
+- V_band_correction
+- lectura de las efemérides de Horizons (get_ephemerides)
+- observations_COBS
+- datos_SLC (de punta a punta)
+
+Las respuestas se generan de forma sintética o, con --fixtures, se leen de un
+directorio <fixtures>/<tamaño>/ (si no existe se generan y se guardan ahí, de
+modo que las siguientes ejecuciones repiten exactamente las mismas respuestas;
+también se pueden copiar ahí respuestas reales grabadas).
+
+La memoria se mide con tracemalloc (asignaciones de Python) en una ejecución
+aparte de las de tiempo; los buffers de Polars/Arrow no pasan por tracemalloc,
+por eso también se informa el máximo de memoria residente del proceso.
+
+Uso:
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import polars as pl
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from paq_Datos_SLC import DATA, Information
+
+OBJECT = "433"
+COMET = "12P"
+START_DATE = "2000-01-01"
+COBS_PAGE_SIZE = 1000
+BANDS = ["V", "R", "G", "r", "g", "o", "c", "w", "i", "B", "", "Vj"]
+
+
+#---------------Respuestas sintéticas----------------
+def obs_time(i):
+    # Una observación cada 37 minutos desde START_DATE
+    return datetime(2000, 1, 1) + timedelta(minutes=37 * i)
+
+
+def make_MPC(n_obs, seed=0):
+    rnd = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<ades version="2022"><obsBlock><obsData>']
+    for i in range(n_obs):
+        t = obs_time(i)
+        if i % 7 == 0:
+            ts = t.strftime("%Y-%m-%d") + f".{rnd.randint(0, 99999):05d}"
+        else:
+            ts = t.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        band = rnd.choice(BANDS)
+        mag = f"<mag>{rnd.uniform(12, 20):.2f}</mag>" if i % 5 else ""
+        band = f"<band>{band}</band>" if band else ""
+        parts.append(f"<optical><permID>{OBJECT}</permID><mode>CCD</mode><stn>I41</stn><obsTime>{ts}</obsTime>"
+                     f"<ra>{rnd.uniform(0, 360):.6f}</ra><dec>{rnd.uniform(-30, 30):.6f}</dec>{mag}{band}</optical>")
+    parts.append("</obsData></obsBlock></ades>")
+    return json.dumps([{"XML": "".join(parts)}]).encode()
+
+
+def make_horizons(n_days):
+    # Tabla de ancho fijo con las mismas columnas que usa DATA._parse_ephemerides
+    lines = []
+    day0 = datetime(2000, 1, 1)
+    for i in range(n_days):
+        row = [" "] * 120
+
+        def put(start, stop, text):
+            row[start:stop] = list(text.rjust(stop - start))
+
+        put(1, 18, (day0 + timedelta(days=i)).strftime("%Y-%b-%d") + " 00:00")
+        put(48, 63, f"{2 + i * 1e-5:.11f}")
+        put(76, 93, f"{1 + i * 1e-5:.14f}")
+        put(108, 115, f"{(i % 40) * 0.5:.4f}")
+        lines.append("".join(row).rstrip())
+    result = "header\n$$SOE\n" + "\n".join(lines) + "\n$$EOE\nfooter"
+    return json.dumps({"result": result}).encode()
+
+
+def make_COBS(n_obs, seed=0):
+    rnd = random.Random(seed)
+    observations = []
+    for i in range(n_obs):
+        mag = rnd.choice([f"{rnd.uniform(5, 15):.1f}", round(rnd.uniform(5, 15), 2), None])
+        observations.append({"id": i, "obs_date": obs_time(i).strftime("%Y-%m-%d %H:%M:%S"),
+                             "magnitude": mag, "observer": {"name": "bench"}})
+    n_pages = -(-n_obs // COBS_PAGE_SIZE)
+    return [json.dumps({"objects": observations[p * COBS_PAGE_SIZE:(p + 1) * COBS_PAGE_SIZE],
+                        "info": {"count": n_obs, "pages": n_pages}}).encode()
+            for p in range(n_pages)]
+
+
+def load_fixtures(size, directory=None):
+    """
+    Respuestas para `size` observaciones: se leen de <directory>/<size>/ o se
+    generan (y se guardan ahí si se indicó el directorio).
+    """
+    n_days = (obs_time(size - 1) - datetime(2000, 1, 1)).days + 2
+    path = Path(directory) / str(size) if directory else None
+    if path is not None and (path / "mpc.json").exists():
+        cobs = sorted(path.glob("cobs_*.json"), key=lambda p: int(p.stem.split("_")[1]))
+        return {"mpc": (path / "mpc.json").read_bytes(),
+                "horizons": (path / "horizons.json").read_bytes(),
+                "cobs": [p.read_bytes() for p in cobs],
+                "end_date": (datetime(2000, 1, 1) + timedelta(days=n_days - 1)).strftime("%Y-%m-%d")}
+
+    fixtures = {"mpc": make_MPC(size), "horizons": make_horizons(n_days), "cobs": make_COBS(size),
+                "end_date": (datetime(2000, 1, 1) + timedelta(days=n_days - 1)).strftime("%Y-%m-%d")}
+    if path is not None:
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "mpc.json").write_bytes(fixtures["mpc"])
+        (path / "horizons.json").write_bytes(fixtures["horizons"])
+        for page, content in enumerate(fixtures["cobs"], start=1):
+            (path / f"cobs_{page}.json").write_bytes(content)
+    return fixtures
+
+
+#---------------Transporte local----------------
+class _Response:
+    def __init__(self, content):
+        self.content = content
+        self.status_code = 200
+        self.ok = True
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ReplayTransport:
+    """
+    Reemplazo de `Transport` que responde desde las respuestas grabadas.
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+
+    def _route(self, url):
+        if "get-obs" in url:
+            return self.fixtures["mpc"]
+        if "horizons" in url:
+            return self.fixtures["horizons"]
+        if "obs_list" in url:
+            page = int(re.search(r"page=(\d+)", url).group(1))
+            pages = self.fixtures["cobs"]
+            return pages[page - 1] if page <= len(pages) else json.dumps({"objects": []}).encode()
+        raise RuntimeError(f"Consulta sin respuesta grabada: {url}")
+
+    def get(self, url, **kwargs):
+        return _Response(self._route(url))
+
+    def post(self, url, **kwargs):
+        return _Response(self._route(url))
+
+    def mount(self, session):
+        return session
+
+    def set_rate_limit(self, host, rate):
+        pass
+
+
+def register_object():
+    # Identificador y órbita del objeto sin consultar astroquery
+    identifier = {"found": 1, "permid": OBJECT, "name": "Eros", "object_type": ["Minor Planet"]}
+    orbit = {"period": "1.76", "perihelion_date": "2001-05-03.123"}
+    Information.register(Information.from_data(OBJECT, identifier, orbit))
+
+
+#---------------Medición----------------
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rows = result.shape[0] if hasattr(result, "shape") else None
+    return {
+        "seconds": min(times),
+        "seconds_mean": sum(times) / len(times),
+        "python_peak_mb": peak / 2**20,
+        "rows": rows,
+    }
+
+
+def run(sizes, repeat, fixtures_dir=None):
+    register_object()
+    results = {}
+    for size in sizes:
+        fixtures = load_fixtures(size, fixtures_dir)
+        end_date = fixtures["end_date"]
+        mpc = DATA(transport=ReplayTransport(fixtures))
+
+        df_clean = mpc._MPC_frame(mpc._fetch_MPC_xml(OBJECT), ["obsTime", "mag", "band"]) \
+            .select(["obsTime", "mag", "band"]).drop_nulls(subset=["mag"]) \
+            .with_columns(pl.col("mag").cast(pl.Float64), pl.col("band").cast(pl.Utf8))
+        raw_horizons = json.loads(fixtures["horizons"])["result"]
+
+        stages = {
+            "observations_MPC_raw": lambda: mpc.observations_MPC_raw(OBJECT),
+            "observations_MPC": lambda: mpc.observations_MPC(OBJECT),
+            "V_band_correction": lambda: mpc.V_band_correction(df_clean),
+            "get_ephemerides": lambda: mpc._parse_ephemerides(raw_horizons),
+            "observations_COBS": lambda: mpc.observations_COBS(COMET, START_DATE, end_date),
+            "datos_SLC": lambda: mpc.datos_SLC(OBJECT, START_DATE, end_date, "Asteroide"),
+        }
+        for name, fn in stages.items():
+            key = f"{name}@{size}"
+            results[key] = measure(fn, repeat)
+            r = results[key]
+            print(f"{key:<32} {r['seconds']:9.4f} s  {r['python_peak_mb']:9.1f} MB  filas={r['rows']}", flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Etapas cuyo tiempo empeoró más de `tolerance` (fracción) respecto de la línea base.
+    """
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base is None or not base.get("seconds"):
+            continue
+        ratio = r["seconds"] / base["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((key, base["seconds"], r["seconds"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="número de observaciones de cada caso (ej. 1000 10000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones por etapa (se informa la mínima)")
+    parser.add_argument("--fixtures", help="directorio de respuestas grabadas (se crea si no existe)")
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="resultados JSON de referencia para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="empeoramiento relativo permitido respecto de la línea base (por defecto 0.25)")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.fixtures)
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "platform": platform.platform(),
+            "rss_max_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"resultados guardados en {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after, ratio in regressions:
+            print(f"REGRESIÓN {key}: {before:.4f} s -> {after:.4f} s (x{ratio:.2f})")
+        if regressions:
+            sys.exit(1)
+        print("sin regresiones respecto de la línea base")
+
+
+if __name__ == "__main__":
+    main()
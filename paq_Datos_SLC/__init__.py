@@ -1,4 +1,51 @@
-from .info import Information
-from .data import DATA
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Information", "DATA"]
\ No newline at end of file
+# Los módulos se importan recién al pedir cada nombre (ej. `from paq_Datos_SLC import DATA`),
+# de modo que importar el paquete no carga astroquery, pandas, requests ni aiohttp.
+_exports = {
+    "Information": ".info",
+    "DATA": ".data",
+    "ResponseCache": ".cache",
+    "CacheMissError": ".cache",
+    "Transport": ".transport",
+    "AsyncDATA": ".async_data",
+    "ObservationStore": ".store",
+    "EphemerisStore": ".store",
+    "SLCDataset": ".store",
+    "FamilyIndex": ".family",
+    "get_family_index": ".family",
+    "COBSCatalog": ".cobs",
+    "get_COBS_catalog": ".cobs",
+    "Span": ".trace",
+    "TraceSummary": ".trace",
+    "SLC_envelope": ".envelope",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .info import Information
+    from .data import DATA
+    from .cache import ResponseCache, CacheMissError
+    from .transport import Transport
+    from .async_data import AsyncDATA
+    from .store import ObservationStore, EphemerisStore, SLCDataset
+    from .family import FamilyIndex, get_family_index
+    from .cobs import COBSCatalog, get_COBS_catalog
+    from .trace import Span, TraceSummary
+    from .envelope import SLC_envelope
\ No newline at end of file
@@ -0,0 +1,344 @@
+import asyncio
+import json
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qs, urlsplit
+from datetime import datetime, timezone
+import polars as pl
+from .data import DATA
+from .info import Information
+from .cache import CacheMissError, cached_fetch_async
+from .trace import trace_span
+
+try:
+    import aiohttp
+except ImportError:  # Dependencia opcional: pip install paq_Datos_SLC[async]
+    aiohttp = None
+
+
+# Clase asíncrona equivalente a DATA (para servicios basados en asyncio)
+class AsyncDATA(DATA):
+    """
+    Cliente asíncrono de las APIs del MPC, Horizons y COBS.
+
+    Ofrece versiones `async` de los métodos de descarga de `DATA` y de las
+    consultas de `Information`. Las transformaciones (corrección a banda V,
+    magnitud reducida, organización de la tabla) son las mismas de `DATA`.
+    En `datos_SLC_async` la descarga de observaciones, la de efemérides y la
+    consulta de la órbita se hacen al mismo tiempo.
+
+    Requiere `aiohttp` (pip install paq_Datos_SLC[async]).
+
+    Parámetros
+    ----------
+    output_format : str, opcional
+        Formato de salida solicitado al MPC (por defecto "XML").
+    cache : ResponseCache, opcional
+        Caché en disco de las respuestas, compartida con la versión síncrona.
+    ephemerides : EphemerisStore, opcional
+        Almacén local de efemérides (ver `DATA`).
+    tracer : callable, opcional
+        Recibe la medición de cada etapa (ver `DATA` y `TraceSummary`).
+    parse_workers, parse_threshold : opcional
+        Lectura de respuestas grandes en procesos aparte (ver `DATA`).
+    compact : bool, opcional
+        Esquema compacto de las tablas (ver `DATA`).
+    session : aiohttp.ClientSession, opcional
+        Sesión HTTP a reutilizar. Si es None se crea una propia al primer uso.
+    limit : int, opcional
+        Conexiones simultáneas máximas de la sesión propia (por defecto 10).
+    timeout : float, opcional
+        Timeout total por consulta en segundos (por defecto 300).
+    retries : int, opcional
+        Reintentos ante errores de conexión, 429 y 5xx (por defecto 5).
+    backoff_factor : float, opcional
+        Factor de la espera exponencial entre reintentos (por defecto 0.5 s).
+    backoff_max : float, opcional
+        Espera máxima entre reintentos en segundos (por defecto 60).
+
+    Ejemplo
+    --------
+    >>> async with AsyncDATA() as mpc:
+    ...     df = await mpc.datos_SLC_async("Ceres", "2020-01-01", "2024-01-01", "Asteroide")
+    """
+
+    status_forcelist = (429, 500, 502, 503, 504)
+
+    def __init__(self, output_format="XML", cache=None, session=None, limit=10, timeout=300,
+                 retries=5, backoff_factor=0.5, backoff_max=60, ephemerides=None, tracer=None,
+                 parse_workers=0, parse_threshold=1024**2, compact=False):
+        if aiohttp is None:
+            raise ImportError("AsyncDATA requiere aiohttp: pip install paq_Datos_SLC[async]")
+        super().__init__(output_format, cache=cache, ephemerides=ephemerides, tracer=tracer,
+                         parse_workers=parse_workers, parse_threshold=parse_threshold, compact=compact)
+        self.session = session
+        self._own_session = session is None
+        self.limit = limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+    #---------------Sesión HTTP----------------
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None and self._own_session:
+            await self.session.close()
+            self.session = None
+
+    #Espera antes del siguiente intento (Retry-After o espera exponencial)
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(delay, 0.0), self.backoff_max)
+                except (TypeError, ValueError):
+                    pass
+        return min(self.backoff_factor * 2 ** attempt, self.backoff_max)
+
+    async def _request_async(self, method, url, **kwargs):
+        """
+        Consulta HTTP con reintentos; devuelve el contenido de la respuesta en bytes.
+        """
+        session = self._get_session()
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    if response.status in self.status_forcelist and attempt < self.retries:
+                        delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                    elif response.status >= 400:
+                        raise RuntimeError(f"Error {response.status}: {content.decode(errors='replace')}")
+                    else:
+                        return content
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            await asyncio.sleep(delay)
+
+    #---------------Observaciones del MPC----------------
+    async def _fetch_MPC_xml_async(self, selected_object):
+        payload, request = self._MPC_request(selected_object)
+        with trace_span(self.tracer, "mpc_download", object=selected_object) as span:
+            content = await cached_fetch_async(self.cache, "mpc_obs", request, span.fetcher(
+                lambda: self._request_async("GET", self.url_mpc, json=payload), self.cache))
+            span["bytes"] = len(content)
+        return self._MPC_xml(content, selected_object)
+
+    async def observations_MPC_raw_async(self, selected_object, fields=None):
+        """
+        Versión asíncrona de `observations_MPC_raw` (DataFrame de pandas).
+        """
+        return (await self.observations_MPC_async(selected_object, fields)).to_pandas()
+
+    async def observations_MPC_async(self, selected_object, fields=None):
+        """
+        Versión asíncrona de `observations_MPC` (DataFrame de Polars).
+        """
+        xml_string = await self._fetch_MPC_xml_async(selected_object)
+        # El XML se procesa en un hilo para no bloquear el bucle de eventos
+        df = await asyncio.to_thread(self._MPC_frame, xml_string, fields, selected_object)
+        return self._compact_MPC(df)
+
+    async def observations_MPC_clean_async(self, selected_object, start_date, end_date):
+        """
+        Versión asíncrona de `observations_MPC_clean`.
+        """
+        xml_string = await self._fetch_MPC_xml_async(selected_object)
+        df_a = await asyncio.to_thread(self._MPC_frame, xml_string, ["obsTime", "mag", "band"], selected_object)
+        return self._clean_MPC(df_a, start_date, end_date)
+
+    #---------------Efemérides----------------
+    async def get_ephemerides_async(self, selected_object, start_date, end_date, object_type):
+        """
+        Versión asíncrona de `get_ephemerides`.
+        """
+        if self._horizons_input(selected_object, start_date, end_date, object_type) is None:
+            return None
+
+        store = self.ephemerides
+        if store is None:
+            gaps = [(start_date, end_date)]
+        else:
+            key = self._ephemeris_key(selected_object, object_type)
+            gaps = store.missing(key, start_date, end_date)
+
+        # Los bloques que faltan se descargan a la vez
+        chunks = self._ephemeris_chunks(gaps)
+        frames = await asyncio.gather(*(self._fetch_ephemerides_async(selected_object, chunk_start, chunk_end, object_type)
+                                        for chunk_start, chunk_end in chunks))
+        if store is not None:
+            for (chunk_start, chunk_end), df in zip(chunks, frames):
+                if df.shape[0]:
+                    store.add(key, df, chunk_start, chunk_end)
+            return store.query(key, start_date, end_date)
+        return frames[0] if len(frames) == 1 else pl.concat(frames)
+
+    async def _fetch_ephemerides_async(self, selected_object, start_date, end_date, object_type):
+        horizons_input = self._horizons_input(selected_object, start_date, end_date, object_type)
+
+        async def fetch():
+            content = await self._request_async("POST", self.url_horizons, data={'input': horizons_input})
+            # Se valida antes de guardarla en la caché (un error de Horizons no se guarda)
+            self._check_horizons(json.loads(content)["result"])
+            return content
+
+        with trace_span(self.tracer, "horizons_download", object=selected_object) as span:
+            content = await cached_fetch_async(
+                self.cache, "horizons", self._horizons_key(horizons_input), span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        # La tabla se lee en un hilo (con parse_workers, la espera al proceso hijo
+        # tampoco bloquea el bucle de eventos)
+        return await asyncio.to_thread(self._parse_ephemerides, json.loads(content)["result"], selected_object)
+
+    #---------------Observaciones de COBS----------------
+    async def _fetch_COBS_page_async(self, url):
+        with trace_span(self.tracer, "cobs_download", object=parse_qs(urlsplit(url).query).get("des", [None])[0]) as span:
+            content = await cached_fetch_async(self.cache, "cobs_obs", {"url": url},
+                                               span.fetcher(lambda: self._request_async("GET", url), self.cache))
+            span["bytes"] = len(content)
+        return json.loads(content)
+
+    async def observations_COBS_async(self, selected_comet, start_date, end_date, workers=4):
+        """
+        Versión asíncrona de `observations_COBS` (páginas en paralelo).
+        """
+        def url(page):
+            return self._COBS_url(selected_comet, start_date, end_date, page)
+
+        # Las páginas se convierten a Polars en un hilo, fuera del bucle de eventos
+        def page_frame(data):
+            return asyncio.to_thread(self._COBS_page_frame, data["objects"])
+
+        first = await self._fetch_COBS_page_async(url(1))
+        if not first.get("objects"):
+            return self._COBS_frame([], start_date, end_date)  # no hay resultados
+
+        frames = [await page_frame(first)]
+        n_pages = self._COBS_page_count(first)
+        if n_pages is not None:
+            # Total conocido: todas las páginas restantes a la vez
+            pages = await asyncio.gather(*(self._fetch_COBS_page_async(url(page)) for page in range(2, n_pages + 1)))
+            frames.extend(await asyncio.gather(*(page_frame(data) for data in pages if data.get("objects"))))
+        else:
+            # Total desconocido: bloques de `workers` páginas hasta la primera vacía
+            page = 2
+            done = False
+            while not done:
+                pages = await asyncio.gather(*(self._fetch_COBS_page_async(url(p))
+                                               for p in range(page, page + max(1, workers))))
+                for data in pages:
+                    if not data.get("objects"):
+                        done = True  # no hay más resultados
+                        break
+                    frames.append(await page_frame(data))
+                page += max(1, workers)
+        return await asyncio.to_thread(self._COBS_frame, frames, start_date, end_date)
+
+    #---------------Información del objeto----------------
+    async def _query_identifier_async(self, identifier):
+        with trace_span(self.tracer, "mpc_identifier", object=identifier) as span:
+            content = await cached_fetch_async(
+                self.cache, "mpc_identifier", {"id": str(identifier).strip()}, span.fetcher(
+                    lambda: self._request_async("GET", Information.url_identifier, data=identifier), self.cache))
+            span["bytes"] = len(content)
+        return json.loads(content)
+
+    async def information_async(self, selected_object):
+        """
+        Versión asíncrona de `Information.get`: resuelve identificador y órbita
+        del objeto una sola vez por proceso.
+        """
+        info = Information._registered(selected_object)
+        if info is not None:
+            return info
+
+        lookup_failed = False
+        try:
+            identifier = await self._query_identifier_async(selected_object)
+        except CacheMissError:
+            raise  # Modo offline sin la respuesta en caché: no es lo mismo que "no existe"
+        except Exception:
+            identifier = {"found": 0}  # fallback si hay error
+            lookup_failed = True
+        #Para objetos con un identificador igual, se toma el primero
+        disambiguation_list = identifier.get("disambiguation_list")
+        if disambiguation_list:
+            identifier = await self._query_identifier_async(disambiguation_list[0]['permid'])
+
+        info = Information.from_data(selected_object, identifier, None, cache=self.cache, transport=self._transport,
+                                     tracer=self.tracer)
+        request = info._orbit_request()
+        if request is None:
+            pass
+        elif request[0] == "mpc_orbit":
+            # astroquery no tiene interfaz asíncrona: la consulta de la órbita va en un hilo
+            info.orbit_data = await asyncio.to_thread(info._query_orbit, **request[1])
+        elif (orbit := await asyncio.to_thread(info._COBS_catalog_orbit)) is not None:
+            info.orbit_data = orbit
+        else:
+            url = request[1]["url"]
+            with trace_span(self.tracer, "cobs_comet", object=selected_object) as span:
+                content = await cached_fetch_async(self.cache, "cobs_comet", request[1],
+                                                   span.fetcher(lambda: self._request_async("GET", url), self.cache))
+                span["bytes"] = len(content)
+            info.orbit_data = json.loads(content)['object']
+        # Si la consulta del identificador falló no se registra (ver Information.get)
+        if lookup_failed:
+            info._lookup_failed = True
+            return info
+        return Information.register(info)
+
+    #---------------Datos de la SLC----------------
+    async def datos_SLC_async(self, selected_object, start_date, end_date, object_type, info=None,
+                              ephemeris_join="date"):
+        """
+        Versión asíncrona de `datos_SLC`: observaciones, efemérides y órbita se
+        descargan de forma concurrente y se unen al final.
+        """
+        df_obs, df_eph, info = await asyncio.gather(
+            self.observations_MPC_clean_async(selected_object, start_date, end_date),
+            self.get_ephemerides_async(selected_object, start_date, self._ephemeris_stop(end_date, ephemeris_join),
+                                       object_type),
+            self._resolve_information(selected_object, info),
+        )
+        return self._SLC_from_frames(df_obs, df_eph, selected_object, object_type, info,
+                                     ephemeris_join=ephemeris_join)
+
+    async def datos_SLC_COBS_async(self, selected_object, start_date, end_date, object_type, info=None,
+                                   ephemeris_join="date"):
+        """
+        Versión asíncrona de `datos_SLC_COBS`.
+        """
+        df_obs, df_eph, info = await asyncio.gather(
+            self.observations_COBS_async(selected_object, start_date, end_date),
+            self.get_ephemerides_async(selected_object, start_date, self._ephemeris_stop(end_date, ephemeris_join),
+                                       object_type),
+            self._resolve_information(selected_object, info),
+        )
+        if df_obs.select(pl.col("obsTime").is_null().any()).item():
+            return self._empty_SLC()
+        return self._SLC_from_frames(df_obs, df_eph, selected_object, object_type, info,
+                                     ephemeris_join=ephemeris_join)
+
+    async def _resolve_information(self, selected_object, info=None):
+        if info is not None:
+            return info
+        return await self.information_async(selected_object)
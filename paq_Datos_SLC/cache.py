@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+# Tiempo de vida (segundos) por defecto de cada tipo de consulta
+DEFAULT_TTL = {
+    "mpc_obs": 24 * 3600,              # Observaciones del MPC (crecen a diario)
+    "mpc_identifier": 30 * 24 * 3600,  # Identificadores oficiales del MPC (casi nunca cambian)
+    "mpc_orbit": 7 * 24 * 3600,        # Elementos orbitales (astroquery)
+    "horizons": 30 * 24 * 3600,        # Efemérides de JPL Horizons
+    "cobs_obs": 12 * 3600,             # Observaciones de COBS
+    "cobs_comet": 7 * 24 * 3600,       # Información de cometas de COBS
+    "cobs_catalog": 24 * 3600,         # Lista completa de cometas de COBS
+}
+
+
+class CacheMissError(RuntimeError):
+    """
+    Error lanzado en modo offline cuando la consulta no está en la caché.
+    """
+
+
+def default_cache_dir():
+    # Directorio por defecto: variable de entorno o ~/.cache/paq_Datos_SLC
+    env = os.environ.get("PAQ_DATOS_SLC_CACHE")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "paq_Datos_SLC"
+
+
+class ResponseCache:
+    """
+    Caché persistente en disco para las respuestas de las APIs (MPC, Horizons y COBS).
+
+    Cada respuesta se guarda como un archivo identificado por el hash de la
+    consulta normalizada. Cada tipo de consulta (endpoint) tiene su propio tiempo
+    de vida y el tamaño total se acota eliminando primero las entradas usadas
+    hace más tiempo (LRU por bytes).
+
+    Parámetros
+    ----------
+    directory : str o Path, opcional
+        Directorio donde se guardan las respuestas (por defecto ~/.cache/paq_Datos_SLC).
+    ttl : dict, opcional
+        Tiempos de vida en segundos por endpoint; se combinan con `DEFAULT_TTL`.
+        Un valor None significa que la entrada no expira.
+    max_bytes : int, opcional
+        Tamaño máximo total de la caché en bytes (por defecto 2 GiB).
+    offline : bool, opcional
+        Si es True nunca se consulta la red: se sirve solo desde la caché
+        (aunque la entrada haya expirado) y se lanza `CacheMissError` si no existe.
+
+    Ejemplo
+    --------
+    >>> cache = ResponseCache("/tmp/slc_cache", ttl={"mpc_obs": 3600})
+    >>> df = DATA(cache=cache).datos_SLC("Ceres", "2020-01-01", "2024-01-01", "Asteroide")
+    """
+
+    # Al superar max_bytes se borra hasta quedar en esta fracción del límite, para
+    # no recorrer todo el directorio en cada escritura cuando la caché está llena
+    evict_ratio = 0.9
+
+    def __init__(self, directory=None, ttl=None, max_bytes=2 * 1024**3, offline=False):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.ttl = dict(DEFAULT_TTL)
+        if ttl:
+            self.ttl.update(ttl)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Se calcula en la primera escritura
+
+    #---------------Clave de la consulta----------------
+    def key(self, endpoint, request):
+        # Normaliza la consulta (orden de claves y espacios) y calcula su hash
+        normalized = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{endpoint}|{normalized}".encode("utf-8")).hexdigest()
+
+    def _path(self, endpoint, key):
+        return self.directory / endpoint / f"{key}.cache"
+
+    #---------------Lectura----------------
+    def get(self, endpoint, request):
+        """
+        Devuelve el contenido guardado para la consulta o None si no existe o expiró.
+        """
+        path = self._path(endpoint, self.key(endpoint, request))
+        try:
+            with open(path, "rb") as f:
+                created = float(f.readline())
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+
+        ttl = self.ttl.get(endpoint)
+        if not self.offline and ttl is not None and time.time() - created > ttl:
+            return None
+
+        # Marca el acceso para la política LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    #---------------Escritura----------------
+    def set(self, endpoint, request, content: bytes):
+        """
+        Guarda el contenido de la respuesta y aplica el límite de tamaño.
+        """
+        path = self._path(endpoint, self.key(endpoint, request))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Escritura atómica: archivo temporal + reemplazo
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(f"{time.time()}\n".encode("ascii"))
+            f.write(content)
+
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += path.stat().st_size - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def fetch(self, endpoint, request, fetcher):
+        """
+        Devuelve la respuesta desde la caché o, si no existe, la descarga con
+        `fetcher()` (función sin argumentos que devuelve bytes) y la guarda.
+        """
+        content = self.get(endpoint, request)
+        if content is not None:
+            return content
+        self._check_online(endpoint, request)
+        content = fetcher()
+        self.set(endpoint, request, content)
+        return content
+
+    async def fetch_async(self, endpoint, request, fetcher):
+        """
+        Igual que `fetch`, pero `fetcher()` es una corrutina (cliente asíncrono).
+        """
+        content = self.get(endpoint, request)
+        if content is not None:
+            return content
+        self._check_online(endpoint, request)
+        content = await fetcher()
+        self.set(endpoint, request, content)
+        return content
+
+    def _check_online(self, endpoint, request):
+        if self.offline:
+            raise CacheMissError(f"Consulta '{endpoint}' no disponible en la caché (modo offline): {request}")
+
+    #---------------Tamaño y limpieza----------------
+    def _entries(self):
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.glob("*/*.cache") if p.is_file()]
+
+    def _scan_size(self):
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _evict(self):
+        # Elimina las entradas con acceso más antiguo hasta quedar bajo evict_ratio * max_bytes
+        entries = []
+        for p in self._entries():
+            st = p.stat()
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.evict_ratio
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self, endpoint=None):
+        """
+        Borra todas las entradas de la caché (o solo las de un endpoint).
+        """
+        with self._lock:
+            for p in self._entries():
+                if endpoint is None or p.parent.name == endpoint:
+                    p.unlink(missing_ok=True)
+            self._total_bytes = None
+
+
+#---------------Consulta con caché opcional----------------
+def cached_fetch(cache, endpoint, request, fetcher):
+    # Si no hay caché configurada se descarga directamente
+    if cache is None:
+        return fetcher()
+    return cache.fetch(endpoint, request, fetcher)
+
+
+async def cached_fetch_async(cache, endpoint, request, fetcher):
+    # Versión asíncrona de cached_fetch (fetcher es una corrutina)
+    if cache is None:
+        return await fetcher()
+    return await cache.fetch_async(endpoint, request, fetcher)
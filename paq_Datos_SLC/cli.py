@@ -0,0 +1,159 @@
+"""
+Cálculo por lotes de la SLC de muchos objetos, con puntos de control.
+
+Los objetos se indican uno por uno, en un archivo (uno por línea) o como
+una familia de `family.json`. Cada resultado se guarda en un `SLCDataset`
+apenas termina y queda anotado en el manifiesto `<salida>/manifest.jsonl`;
+si la ejecución se corta, al volver a lanzarla con los mismos parámetros se
+saltean los objetos ya terminados (los que fallaron se vuelven a intentar).
+Sin --end se usa la fecha final de la última ejecución guardada en el
+manifiesto (o la de hoy si no hay), de modo que retomar al día siguiente no
+cuenta como un cambio de parámetros.
+
+Uso:
+    datos-slc --family hilda --start 2000-01-01 --output /data/slc --workers 8
+    datos-slc 433 1P "C/2023 A3" --start 2015-01-01 --output /data/slc --offline
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+
+class Manifest:
+    """
+    Manifiesto de avance de una ejecución por lotes (un JSON por línea).
+
+    Cada objeto terminado agrega una línea con su estado ("done" o "error"),
+    el rango de fechas pedido, las filas y el error; las líneas {"run": ...}
+    guardan los parámetros de cada ejecución. Solo se agregan líneas,
+    con flush y fsync, de modo que un corte a mitad de la escritura pierde a
+    lo sumo la última; al leerlo vale la última línea de cada objeto.
+
+    Parámetros
+    ----------
+    path : str o Path
+        Archivo del manifiesto (se crea si no existe).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.run = None
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Línea incompleta de una ejecución cortada
+                    if "run" in entry:
+                        self.run = entry["run"]
+                    else:
+                        self.entries[entry["object"]] = entry
+
+    def done(self, selected_object, start_date, end_date, source):
+        # Terminado antes con los mismos parámetros
+        entry = self.entries.get(str(selected_object))
+        return (entry is not None and entry.get("status") == "done" and entry.get("start") == start_date
+                and entry.get("end") == end_date and entry.get("source") == source)
+
+    def record(self, selected_object, status, start_date, end_date, source, rows=None, error=None):
+        entry = {"object": str(selected_object), "status": status, "start": start_date, "end": end_date,
+                 "source": source, "rows": rows, "error": error,
+                 "finished_at": datetime.now(timezone.utc).isoformat()}
+        self._write(entry)
+        self.entries[entry["object"]] = entry
+
+    def record_run(self, start_date, end_date, source):
+        # Parámetros de la ejecución (solo se agrega una línea si cambiaron)
+        run = {"start": start_date, "end": end_date, "source": source}
+        if run != self.run:
+            self._write({"run": run})
+            self.run = run
+
+    def _write(self, entry):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _read_objects(args):
+    # Objetos de la línea de comandos, del archivo y de la familia, sin repetir y en orden
+    objects = list(args.objects)
+    if args.objects_file:
+        with open(args.objects_file, "r", encoding="utf-8") as f:
+            objects += [line.split("#")[0].strip() for line in f]
+    if args.family:
+        from .family import get_family_index
+        members = get_family_index().members(args.family)
+        if not len(members):
+            raise SystemExit(f"La familia '{args.family}' no existe o no tiene miembros")
+        objects += [str(permid) for permid in members]
+    objects = list(dict.fromkeys(o for o in objects if o))
+    if not objects:
+        raise SystemExit("No se indicó ningún objeto (objetos, --objects-file o --family)")
+    return objects
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="datos-slc", description=__doc__.splitlines()[1])
+    parser.add_argument("objects", nargs="*", help="identificadores de los objetos (ej. 433 1P)")
+    parser.add_argument("--objects-file", help="archivo con un objeto por línea (# para comentarios)")
+    parser.add_argument("--family", help="nombre de una familia de family.json (ej. hilda)")
+    parser.add_argument("--start", required=True, help="fecha inicial YYYY-MM-DD")
+    parser.add_argument("--end", help="fecha final YYYY-MM-DD (por defecto la de la ejecución anterior con el "
+                                       "mismo manifiesto, o hoy)")
+    parser.add_argument("--output", required=True, help="directorio del SLCDataset y del manifiesto")
+    parser.add_argument("--source", choices=("auto", "MPC", "COBS"), default="auto",
+                        help="fuente de las observaciones; auto: COBS para cometas que están en COBS, MPC para el resto")
+    parser.add_argument("--workers", type=int, default=8, help="objetos procesados a la vez (por defecto 8)")
+    parser.add_argument("--cache-dir", help="directorio de la caché de respuestas (por defecto ~/.cache/paq_Datos_SLC)")
+    parser.add_argument("--offline", action="store_true",
+                        help="no consultar la red: solo respuestas de la caché (los objetos sin caché fallan)")
+    parser.add_argument("--compact", action="store_true", help="guardar con el esquema compacto (ver DATA)")
+    parser.add_argument("--force", action="store_true", help="recalcular también los objetos ya terminados")
+    return parser
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    objects = _read_objects(args)
+
+    # Las dependencias pesadas se importan recién aquí (--help responde al instante)
+    from .cache import ResponseCache
+    from .data import DATA
+    from .store import SLCDataset
+
+    manifest = Manifest(Path(args.output) / "manifest.jsonl")
+    # Sin --end se retoma la fecha final de la ejecución anterior (no la de hoy)
+    if args.end is None:
+        args.end = manifest.run["end"] if manifest.run else date.today().isoformat()
+    manifest.record_run(args.start, args.end, args.source)
+    pending = [o for o in objects if args.force or not manifest.done(o, args.start, args.end, args.source)]
+    print(f"{len(objects)} objetos, {len(objects) - len(pending)} ya terminados, {len(pending)} pendientes", flush=True)
+
+    mpc = DATA(cache=ResponseCache(args.cache_dir, offline=args.offline), compact=args.compact)
+    dataset = SLCDataset(args.output)
+    failed = 0
+    for i, (obj, df, error) in enumerate(mpc.datos_SLC_many(pending, args.start, args.end, max_workers=args.workers,
+                                                            source=args.source, dataset=dataset), start=1):
+        if error is None:
+            manifest.record(obj, "done", args.start, args.end, args.source, rows=df.shape[0])
+            print(f"[{i}/{len(pending)}] {obj}: {df.shape[0]} filas", flush=True)
+        else:
+            failed += 1
+            manifest.record(obj, "error", args.start, args.end, args.source, error=repr(error))
+            print(f"[{i}/{len(pending)}] {obj}: ERROR {error!r}", flush=True)
+
+    if failed:
+        print(f"{failed} objetos con error (se reintentan al volver a ejecutar)", flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
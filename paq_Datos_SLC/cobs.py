@@ -0,0 +1,164 @@
+import json
+import re
+import threading
+import time
+import polars as pl
+from .cache import DEFAULT_TTL, cached_fetch
+from .trace import trace_span
+
+
+class COBSCatalog:
+    """
+    Catálogo de cometas de COBS descargado una vez y consultado en memoria.
+
+    La lista completa de cometas (comet_list.api) se descarga una sola vez
+    (pasando por la caché en disco, si hay) y se vuelve a pedir cuando pasa
+    `ttl` segundos. Los nombres y designaciones se indexan en un diccionario
+    normalizado (sin espacios y en mayúsculas), de modo que "12p", "12P" o
+    "12P/Pons-Brooks" encuentran el mismo cometa, y `exists_many` resuelve
+    cientos de designaciones con una sola descarga.
+
+    Parámetros
+    ----------
+    cache : ResponseCache, opcional
+        Caché en disco de la respuesta (endpoint "cobs_catalog").
+    transport : Transport, opcional
+        Transporte HTTP (por defecto el compartido del proceso).
+    ttl : float, opcional
+        Segundos tras los cuales se vuelve a descargar el catálogo
+        (por defecto el de "cobs_catalog" en `DEFAULT_TTL`).
+    tracer : callable, opcional
+        Recibe la medición de la descarga (ver `TraceSummary`).
+
+    Ejemplo
+    --------
+    >>> catalog = get_COBS_catalog()
+    >>> catalog.exists("12p")
+    True
+    >>> catalog.exists_many(["12P", "C/2023 A3", "no existe"]).to_list()
+    [True, True, False]
+    """
+
+    url = "https://cobs.si/api/comet_list.api"
+    # Campos de cada cometa que se indexan como nombre o designación
+    name_fields = ("name", "fullname", "mpc_name")
+
+    def __init__(self, cache=None, transport=None, ttl=None, tracer=None):
+        self.cache = cache
+        self._transport = transport
+        self.ttl = ttl if ttl is not None else DEFAULT_TTL["cobs_catalog"]
+        self.tracer = tracer
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self.objects = []
+        self._index = {}
+        self._keys = pl.Series("key", [], dtype=pl.Utf8)
+
+    #---------------Normalización----------------
+    @staticmethod
+    def normalize(designation):
+        # Sin espacios y en mayúsculas ("c/2023 a3" -> "C/2023A3")
+        return re.sub(r"\s+", "", str(designation)).upper()
+
+    def _names(self, entry):
+        for field in self.name_fields:
+            value = entry.get(field)
+            if value:
+                yield value
+                # "12P/Pons-Brooks" también se indexa como "12P"
+                prefix = str(value).split("/")[0]
+                if "/" in str(value) and re.fullmatch(r"\d+[PDI](-\w+)?", prefix.strip()):
+                    yield prefix
+
+    #---------------Descarga e índice----------------
+    @property
+    def transport(self):
+        if self._transport is None:
+            from .transport import default_transport
+            self._transport = default_transport()
+        return self._transport
+
+    def _download(self):
+        def fetch():
+            response = self.transport.get(self.url)
+            response.raise_for_status()
+            return response.content
+
+        with trace_span(self.tracer, "cobs_catalog") as span:
+            content = cached_fetch(self.cache, "cobs_catalog", {"url": self.url}, span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+            objects = json.loads(content).get("objects") or []
+            span["rows_out"] = len(objects)
+        return objects
+
+    def refresh(self):
+        """
+        Descarga el catálogo (o lo lee de la caché) y reconstruye el índice.
+        """
+        objects = self._download()
+        index = {}
+        for i, entry in enumerate(objects):
+            for name in self._names(entry):
+                index.setdefault(self.normalize(name), i)
+        with self._lock:
+            self.objects = objects
+            self._index = index
+            self._keys = pl.Series("key", list(index), dtype=pl.Utf8)
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        with self._lock:
+            fresh = self._loaded_at is not None and (self.ttl is None or time.monotonic() - self._loaded_at < self.ttl)
+        if not fresh:
+            self.refresh()
+
+    #---------------Búsquedas----------------
+    def get(self, designation):
+        """
+        Entrada del catálogo (diccionario de COBS) del cometa o None si no está.
+        """
+        self._ensure_loaded()
+        i = self._index.get(self.normalize(designation))
+        return self.objects[i] if i is not None else None
+
+    def exists(self, designation):
+        self._ensure_loaded()
+        return self.normalize(designation) in self._index
+
+    def exists_many(self, designations):
+        """
+        Si cada designación está en COBS (búsqueda vectorizada sobre el índice).
+
+        Retorna
+        -------
+        polars.Series
+            Serie booleana "exists" en el mismo orden de la entrada.
+        """
+        self._ensure_loaded()
+        values = designations if isinstance(designations, pl.Series) else pl.Series(designations, dtype=pl.Utf8, strict=False)
+        normalized = values.cast(pl.Utf8).str.replace_all(r"\s+", "").str.to_uppercase()
+        return normalized.is_in(self._keys).fill_null(False).alias("exists")
+
+    def __contains__(self, designation):
+        return self.exists(designation)
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self.objects)
+
+
+#---------------Catálogo compartido por el proceso----------------
+_cobs_catalog = None
+_cobs_lock = threading.Lock()
+
+
+def get_COBS_catalog(cache=None, transport=None, tracer=None):
+    """
+    Catálogo de COBS compartido por el proceso (se crea en el primer uso, con
+    la caché y el transporte de quien lo pidió primero).
+    """
+    global _cobs_catalog
+    with _cobs_lock:
+        if _cobs_catalog is None:
+            _cobs_catalog = COBSCatalog(cache=cache, transport=transport, tracer=tracer)
+        return _cobs_catalog
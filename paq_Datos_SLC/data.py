@@ -1,16 +1,66 @@
-import requests
-import pandas as pd
 import polars as pl
 import numpy as np
 import xml.etree.ElementTree as ET
 import html, re
-from datetime import datetime, timedelta
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .info import *
+from .cache import cached_fetch
+from .trace import trace_span
+from .parallel import get_process_pool, to_ipc, from_ipc
+
+#---------------Corrección a banda V----------------
+# Corrección de cada banda del MPC a la banda V (NaN: banda sin corrección, se descarta)
+CORRECCIONES = {
+    'V':0,'R':0.4,'G':0.28,'C':0.4,'r':0.14,'g':-0.35,'c':-0.05,'o':0.33,'w':-0.13,'i':0.32,'v':0,'Vj':0,
+    'Rc':0.4,'Sg':-0.35,'Sr':0.14,'Si':0.32,'Pg':-0.35,'Pr':0.14,'Pi':0.32,'Pw':-0.13,'Ao':0.33,'Ac':-0.05,
+    ''  :np.nan,'U':np.nan,'u':np.nan,'B':np.nan,'I':np.nan,'J':np.nan,'H':np.nan,'K':np.nan,
+    'W':np.nan,'Y':np.nan,'z':np.nan,'y':np.nan,'Lu':np.nan,'Lg':np.nan,'Lr':np.nan,'Lz':np.nan,'Ly':np.nan,
+    'VR':np.nan,'Ic':np.nan,'Bj':np.nan,'Uj':np.nan,'Sz':np.nan,'Pz':np.nan,'Py':np.nan,
+    'Gb':np.nan,'Gr':np.nan,'N':np.nan,'T':np.nan
+}
+
+# Bandas conocidas como Enum (esquema compacto: un entero por fila en lugar de un texto)
+BANDAS = pl.Enum(list(CORRECCIONES))
+
+# Tabla de correcciones armada una sola vez (con la banda como texto y como Enum)
+TABLA_CORR = pl.DataFrame(
+    {"band": list(CORRECCIONES.keys()), "corr": list(CORRECCIONES.values())},
+    schema={"band": pl.Utf8, "corr": pl.Float64},
+    strict=False,
+)
+TABLA_CORR_ENUM = TABLA_CORR.with_columns(pl.col("band").cast(BANDAS))
+
+#---------------Esquema compacto----------------
+# Tipos de la tabla de la SLC con `compact=True` (los valores ya están redondeados a 0.01)
+ESQUEMA_SLC_COMPACTO = {
+    "Anio": pl.Int16, "Mes": pl.Int8, "Dia": pl.Float32, "t-Tq": pl.Float32, "Delta": pl.Float32,
+    "r": pl.Float32, "Fase": pl.Float32, "Magn_obs": pl.Float32, "Magn_redu": pl.Float32,
+}
+# Campos del XML del MPC que `observations_MPC` convierte con `compact=True`
+ESQUEMA_MPC_COMPACTO = {
+    "band": pl.Categorical, "mode": pl.Categorical, "stn": pl.Categorical, "astCat": pl.Categorical,
+    "photCat": pl.Categorical, "obsType": pl.Categorical, "mag": pl.Float32, "rmsMag": pl.Float32,
+    "ra": pl.Float64, "dec": pl.Float64,
+}
 
 # Clase que consulta y procesa los datos necesarios para la SLC
 class DATA:
+
+    # Días máximos por consulta a Horizons (la API limita el tamaño de cada tabla)
+    horizons_chunk_days = 20000
+    # Paso fino de Horizons y umbrales de cambio diario (relativo en Delta, grados en Fase)
+    # a partir de los cuales `adaptive_step` refina las efemérides
+    refine_step = '1 h'
+    refine_delta_tol = 0.01
+    refine_phase_tol = 1.0
     
-    def __init__(self, output_format="XML"):
+    def __init__(self, output_format="XML", cache=None, transport=None, ephemerides=None, tracer=None,
+                 parse_workers=0, parse_threshold=1024**2, compact=False):
         """
         Constructor de la clase DATA.
 
@@ -19,7 +69,38 @@ class DATA:
         - MPC (Minor Planet Center): para la descarga de observaciones astronómicas.
         - NASA JPL Horizons API: para la obtención de efemérides de cuerpos menores.
 
-        No requiere parámetros de entrada.
+        Parámetros
+        ----------
+        output_format : str, opcional
+            Formato de salida solicitado al MPC (por defecto "XML").
+        cache : ResponseCache, opcional
+            Caché en disco de las respuestas de las APIs, compartida con `Information`.
+            Si es None (por defecto) todas las consultas van a la red.
+        transport : Transport, opcional
+            Transporte HTTP (pool de conexiones, timeouts y reintentos). Por defecto
+            se usa el transporte compartido del proceso.
+        ephemerides : EphemerisStore, opcional
+            Almacén local de efemérides. Si se indica, `get_ephemerides` responde
+            desde él y solo consulta a Horizons los rangos de fechas que faltan.
+        tracer : callable, opcional
+            Función que recibe un diccionario por cada etapa (descargas, lecturas,
+            unión de la SLC) con su duración, bytes, filas y uso de la caché
+            (ver `Span` y `TraceSummary`). También se pasa a `Information`.
+        parse_workers : int, opcional
+            Procesos para leer las respuestas grandes del MPC (XML) y de Horizons
+            en paralelo, fuera del GIL. Con 0 (por defecto) todo se lee en el
+            proceso actual. Las tablas vuelven en formato Arrow IPC. Los
+            procesos se crean con "spawn": el script que use esta opción debe
+            proteger su código con `if __name__ == "__main__":`.
+        parse_threshold : int, opcional
+            Tamaño mínimo en bytes de una respuesta para enviarla a otro proceso
+            (por defecto 1 MiB); las más chicas se leen aquí, donde es más barato.
+        compact : bool, opcional
+            Esquema compacto para tener muchos objetos en memoria: la banda
+            como Enum (`BANDAS`), Float32 en las columnas redondeadas a 0.01
+            de la SLC y enteros chicos en Anio y Mes (ver `ESQUEMA_SLC_COMPACTO`);
+            `observations_MPC` devuelve categóricos y números en lugar de textos.
+            Por defecto False (Float64 y textos, como siempre).
 
         Ejemplo:
         --------
@@ -31,6 +112,35 @@ class DATA:
         self.url_horizons = "https://ssd.jpl.nasa.gov/api/horizons_file.api"
         #formato de salida
         self.output_format = output_format
+        #caché de respuestas (opcional)
+        self.cache = cache
+        #transporte HTTP compartido (sesión con pool de conexiones y reintentos), creado al primer uso
+        self.transport = transport
+        #almacén de efemérides por objeto (opcional)
+        self.ephemerides = ephemerides
+        #tracer de etapas (opcional)
+        self.tracer = tracer
+        #lectura en procesos aparte de las respuestas grandes (opcional)
+        self.parse_workers = parse_workers
+        self.parse_threshold = parse_threshold
+        #esquema compacto de las tablas (opcional)
+        self.compact = compact
+
+    #Transporte HTTP: si no se indicó, el compartido del proceso (requests se importa recién aquí)
+    @property
+    def transport(self):
+        if self._transport is None:
+            from .transport import default_transport
+            self._transport = default_transport()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = transport
+
+    #Si la respuesta es lo bastante grande para leerla en otro proceso
+    def _use_process_pool(self, payload):
+        return bool(self.parse_workers) and len(payload) >= self.parse_threshold
 
     #Método para limpiar cadenas XML con caracteres no válidos o mal escapados
     def _sanitize_xml(self, xml_string: str) -> str:
@@ -45,7 +155,9 @@ class DATA:
         return s
 
     #Convertir fecha de observacion a objetos datatime (parsear fechas de las observaciones)
+    #Versión fila a fila; se conserva como referencia para los benchmarks de _parse_obs_times
     def _parse_obs_time(self, date):
+        import pandas as pd
         if date is None or pd.isna(date):  # Maneja valores nulos o NaN
             return pd.NaT
         date = date.strip()
@@ -65,19 +177,153 @@ class DATA:
             pass
         return pd.NaT  # Devuelve fecha vacía si no pudo parsear
 
+    #Conversión vectorizada de la columna de fechas de observación
+    def _parse_obs_times(self, column="obsTime"):
+        """
+        Expresión de Polars que convierte una columna de texto en Datetime (UTC).
+
+        Interpreta en una sola pasada sobre la columna tanto las fechas ISO
+        ("2024-01-01T03:04:05.123Z", "2024-01-01 03:04:05", "2024-01-01") como el
+        formato de día fraccionado "YYYY-MM-DD.ddddd". Los valores que no se pueden
+        interpretar quedan como nulos.
+        """
+        s = pl.col(column).str.strip_chars()
+        # ISO: se quita la zona UTC explícita y se unifica el separador fecha-hora
+        iso = s.str.replace(r"(Z|[+-]00:?00)$", "").str.replace(" ", "T")
+        # Día fraccionado: fecha base + fracción del día
+        frac = s.str.extract_groups(r"^(\d{4}-\d{2}-\d{2})\.(\d+)$")
+        frac_day = (pl.lit("0.") + frac.struct.field("2")).cast(pl.Float64)
+
+        return pl.coalesce(
+            iso.str.strptime(pl.Datetime("us"), "%Y-%m-%dT%H:%M:%S%.f", strict=False),
+            iso.str.strptime(pl.Datetime("us"), "%Y-%m-%dT%H:%M", strict=False),
+            iso.str.strptime(pl.Date, "%Y-%m-%d", strict=False).cast(pl.Datetime("us")),
+            frac.struct.field("1").str.strptime(pl.Date, "%Y-%m-%d", strict=False).cast(pl.Datetime("us"))
+                + pl.duration(microseconds=(frac_day * 86_400_000_000).round(0).cast(pl.Int64)),
+        ).dt.replace_time_zone("UTC").alias(column)
+
+    #Lectura en streaming del XML del MPC (iterparse), columna por columna
+    def _iter_MPC_xml(self, xml_string, fields=None):
+        # Columnas en construcción: nombre -> lista de valores
+        columns = {field: [] for field in fields} if fields is not None else {}
+        n_rows = 0
+        stack = []
+        for event, elem in ET.iterparse(io.StringIO(xml_string), events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem.tag != "optical":
+                continue
+            # Observación óptica: solo se guardan los campos pedidos
+            for child in elem:
+                if fields is None and child.tag not in columns:
+                    columns[child.tag] = [None] * n_rows  # Campo nuevo: se rellena hacia atrás
+                values = columns.get(child.tag)
+                if values is None:
+                    continue
+                if len(values) == n_rows:
+                    values.append(child.text)
+                else:
+                    values[-1] = child.text  # Campo repetido: se conserva el último
+            n_rows += 1
+            # Campos ausentes en esta observación
+            for values in columns.values():
+                if len(values) < n_rows:
+                    values.append(None)
+            # Libera la memoria del elemento ya procesado
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+        return columns
+
+    def _parse_MPC_xml(self, xml_string, fields=None):
+        """
+        Convierte el XML de observaciones del MPC en un DataFrame de Polars.
+
+        Se recorre el XML con `iterparse` liberando cada elemento `<optical>` tras
+        leerlo, y solo se guardan los campos indicados en `fields` (todos si es None),
+        de modo que la memoria usada queda cerca del tamaño del resultado.
+        """
+        try:
+            # Intenta parsear el XML directamente
+            columns = self._iter_MPC_xml(xml_string, fields)
+        except ET.ParseError:
+            # Si falla, limpia el XML y vuelve a intentar
+            columns = self._iter_MPC_xml(self._sanitize_xml(xml_string), fields)
+        return pl.DataFrame(columns, schema={name: pl.Utf8 for name in columns})
+
+    #Consulta al MPC: payload de la API y clave normalizada para la caché
+    def _MPC_request(self, selected_object):
+        # Payload con parámetros de búsqueda (designación del objeto + formato)
+        payload = {"desigs": [selected_object], "output_format": [self.output_format]}
+        return payload, {"desig": str(selected_object).strip(), "format": self.output_format}
+
+    #Extrae el XML de la respuesta JSON del MPC
+    def _MPC_xml(self, content, selected_object):
+        # Convierte la respuesta JSON a diccionario de Python
+        dataset = json.loads(content)
+        # Extrae el XML del primer resultado
+        xml_string = dataset[0].get("XML", "")
+        if not xml_string:
+            raise RuntimeError(f"No se encontró contenido XML para '{selected_object}'")
+        return xml_string
+
+    #Descarga del XML de observaciones del MPC
+    def _fetch_MPC_xml(self, selected_object):
+        payload, request = self._MPC_request(selected_object)
+        
+        def fetch():
+            # Llamado HTTP a la API del MPC (usa GET con json=payload, aunque usualmente se usaría params o POST)
+            response = self.transport.get(self.url_mpc, json=payload)
+            if not response.ok:
+                # Si la respuesta falla, lanza error con código y contenido
+                raise RuntimeError(f"Error {response.status_code}: {response.content.decode()}")
+            return response.content
+
+        # Consulta (o lectura desde la caché) de la respuesta del MPC
+        with trace_span(self.tracer, "mpc_download", object=selected_object) as span:
+            content = cached_fetch(self.cache, "mpc_obs", request, span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        return self._MPC_xml(content, selected_object)
+
+    #Observaciones del MPC como DataFrame de Polars (obsTime ya convertido)
+    def _MPC_frame(self, xml_string, fields=None, selected_object=None):
+        if self._use_process_pool(xml_string):
+            with trace_span(self.tracer, "mpc_parse_process", object=selected_object, bytes=len(xml_string)) as span:
+                df = from_ipc(get_process_pool(self.parse_workers).submit(
+                    _MPC_frame_worker, xml_string, fields, self.output_format).result())
+                span["rows_out"] = df.shape[0]
+            return df
+
+        # Recorre cada entrada "optical" dentro del XML (observaciones ópticas) y arma las columnas
+        with trace_span(self.tracer, "mpc_xml_parse", object=selected_object, bytes=len(xml_string)) as span:
+            df = self._parse_MPC_xml(xml_string, fields)
+            span["rows_out"] = df.shape[0]
+        # Si existe la columna de tiempos de observación, la convierte de una vez a datetime
+        if "obsTime" in df.columns:
+            with trace_span(self.tracer, "obs_time_parse", object=selected_object, rows_in=df.shape[0]) as span:
+                df = df.with_columns(self._parse_obs_times("obsTime"))
+                span["rows_out"] = df.shape[0]
+        return df
+
     # Método público para obtener observaciones de un objeto específico
-    def observations_MPC_raw(self, selected_object):
+    def observations_MPC_raw(self, selected_object, fields=None):
         """
         Obtiene observaciones astronómicas de un objeto desde la API oficial del MPC.
 
         Este método consulta la API del Minor Planet Center, descarga las observaciones 
         disponibles en formato XML, las procesa y devuelve un DataFrame de pandas con 
-        la información estructurada.
+        la información estructurada (ver `observations_MPC` para obtenerlo en Polars).
 
         Parámetros
         ----------
         selected_object : str
             Identificador del objeto a consultar (ej. "Ceres", "433", "Pallas").
+        fields : list of str, opcional
+            Campos de cada observación que se conservan (ej. ["obsTime", "mag", "band"]).
+            Si es None (por defecto) se conservan todos. Los campos pedidos que no
+            aparezcan en el XML quedan como columnas nulas.
 
         Retorna
         -------
@@ -99,45 +345,28 @@ class DATA:
         1 2024-01-02  ...   ...    ...
         
         """        
-        # Payload con parámetros de búsqueda (designación del objeto + formato)
-        payload = {"desigs": [selected_object], "output_format": [self.output_format]}
-        
-        # Llamado HTTP a la API del MPC (usa GET con json=payload, aunque usualmente se usaría params o POST)
-        response = requests.get(self.url_mpc, json=payload)
-        if not response.ok:
-            # Si la respuesta falla, lanza error con código y contenido
-            raise RuntimeError(f"Error {response.status_code}: {response.content.decode()}")
-    
-        # Convierte la respuesta JSON a diccionario de Python
-        dataset = response.json()
-        # Extrae el XML del primer resultado
-        xml_string = dataset[0].get("XML", "")
-        if not xml_string:
-            raise RuntimeError(f"No se encontró contenido XML para '{selected_object}'")
-    
-        try:
-            # Intenta parsear el XML directamente
-            root = ET.fromstring(xml_string)
-        except ET.ParseError:
-            # Si falla, limpia el XML y vuelve a intentar
-            xml_string = self._sanitize_xml(xml_string)
-            root = ET.fromstring(xml_string)
-    
-        # Lista donde se almacenarán las observaciones extraídas
-        observations = []
-        # Recorre cada entrada "optical" dentro del XML (observaciones ópticas)
-        for obs in root.findall(".//optical"):
-            data = {child.tag: child.text for child in obs}  # Convierte cada nodo hijo en diccionario
-            observations.append(data)
-    
-        # Convierte la lista de observaciones en un DataFrame de pandas
-        df = pd.DataFrame(observations)
-    
-        # Si existe la columna de tiempos de observación, la parsea con la función personalizada
-        if "obsTime" in df.columns:
-            df["obsTime"] = df["obsTime"].apply(self._parse_obs_time)
-    
-        return df  # Devuelve el DataFrame con las observaciones            
+        # Compatibilidad: mismo resultado que `observations_MPC`, convertido a pandas
+        return self.observations_MPC(selected_object, fields).to_pandas()
+
+    def observations_MPC(self, selected_object, fields=None):
+        """
+        Igual que `observations_MPC_raw`, pero devuelve el DataFrame de Polars
+        tal como se lee del XML (sin pasar por pandas ni columnas de tipo object).
+
+        Retorna
+        -------
+        polars.DataFrame
+            Observaciones con `obsTime` como Datetime en UTC (con `compact`, ver
+            `ESQUEMA_MPC_COMPACTO`).
+        """
+        return self._compact_MPC(self._MPC_frame(self._fetch_MPC_xml(selected_object), fields, selected_object))
+
+    #Tipos compactos de las columnas del XML (solo con compact=True)
+    def _compact_MPC(self, df):
+        if not self.compact:
+            return df
+        return df.with_columns([pl.col(name).cast(dtype, strict=False)
+                                for name, dtype in ESQUEMA_MPC_COMPACTO.items() if name in df.columns])
 
     #Correción a banda V
     def V_band_correction(self, df):
@@ -147,38 +376,27 @@ class DATA:
         
         Parámetros
         ----------
-        df : pl.DataFrame
+        df : pl.DataFrame o pl.LazyFrame
             DataFrame de Polars con columnas:
             - 'mag'  : magnitud observada
-            - 'band' : identificador de banda (str)
+            - 'band' : identificador de banda (str, categórica o Enum `BANDAS`)
         
         Retorna
         -------
-        pl.DataFrame
-            DataFrame con nueva columna 'Magn_obs' corregida.
+        pl.DataFrame o pl.LazyFrame
+            DataFrame (del mismo tipo que la entrada) con nueva columna 'Magn_obs' corregida.
         """
     
-        Correcciones = {
-            'V':0,'R':0.4,'G':0.28,'C':0.4,'r':0.14,'g':-0.35,'c':-0.05,'o':0.33,'w':-0.13,'i':0.32,'v':0,'Vj':0,
-            'Rc':0.4,'Sg':-0.35,'Sr':0.14,'Si':0.32,'Pg':-0.35,'Pr':0.14,'Pi':0.32,'Pw':-0.13,'Ao':0.33,'Ac':-0.05,
-            ''  :np.nan,'U':np.nan,'u':np.nan,'B':np.nan,'I':np.nan,'J':np.nan,'H':np.nan,'K':np.nan,
-            'W':np.nan,'Y':np.nan,'z':np.nan,'y':np.nan,'Lu':np.nan,'Lg':np.nan,'Lr':np.nan,'Lz':np.nan,'Ly':np.nan,
-            'VR':np.nan,'Ic':np.nan,'Bj':np.nan,'Uj':np.nan,'Sz':np.nan,'Pz':np.nan,'Py':np.nan,
-            'Gb':np.nan,'Gr':np.nan,'N':np.nan,'T':np.nan
-        }
-    
-        # Construcción del DataFrame de correcciones forzando tipo Float64
-        tabla_corr = pl.DataFrame(
-            {
-                "band": list(Correcciones.keys()),
-                "corr": list(Correcciones.values())
-            },
-            schema={"band": pl.Utf8, "corr": pl.Float64},  # <-- forzamos dtype
-            strict=False  # <-- permitimos mezcla de tipos y nulos
-        )
+        # Tabla de correcciones armada una sola vez (ver TABLA_CORR); con la banda
+        # como Enum se une por el código entero, sin comparar textos
+        if df.collect_schema()["band"] == BANDAS:
+            tabla_corr = TABLA_CORR_ENUM
+        else:
+            tabla_corr = TABLA_CORR
+            df = df.with_columns(pl.col("band").cast(pl.Utf8))
     
         # Join con el df original
-        df = df.join(tabla_corr, on="band", how="left")
+        df = df.join(self._same_kind(tabla_corr, df), on="band", how="left")
     
         # Magnitud corregida
         df = df.with_columns(
@@ -187,24 +405,39 @@ class DATA:
     
         # Eliminar filas con Magn_obs nula
         df = df.drop_nulls()
-        df = df.filter(~df["Magn_obs"].is_nan())
+        df = df.filter(~pl.col("Magn_obs").is_nan())
     
         return df       
+
+    #Convierte `df` en LazyFrame si `like` lo es (para unir tablas en el plan perezoso)
+    def _same_kind(self, df, like):
+        if isinstance(like, pl.LazyFrame) and isinstance(df, pl.DataFrame):
+            return df.lazy()
+        return df
+
+    #Filtro de fechas [start_date, end_date] sobre obsTime (DataFrame o LazyFrame)
+    def _date_filter(self, df, start_date, end_date):
+        dtype = df.collect_schema()['obsTime']
+        return df.filter((pl.col('obsTime') >= pl.lit(start_date).str.strptime(dtype, strict=False)) &
+                         (pl.col('obsTime') <= pl.lit(end_date).str.strptime(dtype, strict=False)))
         
     #Limpieza de datos observacionales
     def observations_MPC_clean(self, selected_object,start_date, end_date):
         
-        #Datos de observacion crudos
-        df_a = pl.from_pandas(self.observations_MPC_raw(selected_object))
+        #Datos de observacion crudos (solo los campos que usa la SLC)
+        df_a = self._MPC_frame(self._fetch_MPC_xml(selected_object), ["obsTime", "mag", "band"], selected_object)
+        return self._clean_MPC(df_a, start_date, end_date)
 
+    def _clean_MPC(self, df_a, start_date, end_date):
         #Solo se selecciona fecha, magnitud y banda de observacion
         #Se eliminan los registros que no contienen magnitud
-        df_b = df_a[['obsTime', 'mag', 'band']].drop_nulls(subset=["mag"]).with_columns([pl.col("mag").cast(pl.Float64),
-                                                                                         pl.col("band").cast(pl.Utf8)])
+        #Con compact, la banda pasa a Enum (las bandas desconocidas quedan nulas y se descartan igual)
+        band = pl.col("band").cast(BANDAS, strict=False) if self.compact else pl.col("band").cast(pl.Utf8)
+        df_b = df_a.select(['obsTime', 'mag', 'band']).drop_nulls(subset=["mag"]).with_columns([pl.col("mag").cast(pl.Float64),
+                                                                                                band])
 
         #Se restringe al rango de fechas especifico
-        df_c = df_b.filter((pl.col('obsTime') >= pl.lit(start_date).str.strptime(df_b.schema['obsTime'], strict=False)) &
-                           (pl.col('obsTime') <= pl.lit(end_date).str.strptime(df_b.schema['obsTime'], strict=False)))
+        df_c = self._date_filter(df_b, start_date, end_date)
 
         #Se corrige la magnitud a banda V
         df = self.V_band_correction(df_c)
@@ -228,7 +461,7 @@ class DATA:
 
         Retorna
         -------
-        pandas.DataFrame
+        polars.DataFrame
             DataFrame con columnas:
             - 'Date' : Fecha calendario
             - 'Delta' : Distancia Tierra–objeto (ua)
@@ -241,6 +474,70 @@ class DATA:
         >>> df_efe = mpc.efemerides_API("Ceres", "2025-01-01", "2025-01-10")
         >>> df_efe.head()
         """
+        if self._horizons_input(selected_object, start_date, end_date, object_type) is None:
+            return None
+
+        store = self.ephemerides
+        if store is None:
+            gaps = [(start_date, end_date)]
+        else:
+            # Solo se consultan los rangos que no están en el almacén
+            key = self._ephemeris_key(selected_object, object_type)
+            gaps = store.missing(key, start_date, end_date)
+
+        frames = []
+        for chunk_start, chunk_end in self._ephemeris_chunks(gaps):
+            df = self._fetch_ephemerides(selected_object, chunk_start, chunk_end, object_type)
+            if store is not None and df.shape[0]:
+                store.add(key, df, chunk_start, chunk_end)
+            frames.append(df)
+
+        if store is not None:
+            return store.query(key, start_date, end_date)
+        return frames[0] if len(frames) == 1 else pl.concat(frames)
+
+    #Descarga (o lee de la caché) un bloque de efemérides de Horizons
+    def _fetch_ephemerides(self, selected_object, start_date, end_date, object_type, step='1 d'):
+        horizons_input = self._horizons_input(selected_object, start_date, end_date, object_type, step)
+
+        # Enviar como parámetro 'input'
+        def fetch():
+            response = self.transport.post(self.url_horizons, data={'input': horizons_input})
+            response.raise_for_status()
+            # Se valida antes de guardarla en la caché (un error de Horizons no se guarda)
+            self._check_horizons(json.loads(response.content)["result"])
+            return response.content
+
+        with trace_span(self.tracer, "horizons_download", object=selected_object) as span:
+            content = cached_fetch(self.cache, "horizons", self._horizons_key(horizons_input), span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        dataset = json.loads(content)
+
+        # Paso 3: Extraer y procesar el contenido plano del resultado
+        return self._parse_ephemerides(dataset["result"], selected_object)  # Devuelve el DataFrame con las efemerides seleccionadas ( date, delta, r, alpha)
+
+    #Divide los rangos de fechas en bloques de a lo sumo `horizons_chunk_days` días
+    def _ephemeris_chunks(self, ranges):
+        chunks = []
+        for start_date, end_date in ranges:
+            start = datetime.fromisoformat(str(start_date)[:10]).date()
+            end = datetime.fromisoformat(str(end_date)[:10]).date()
+            if (end - start).days < self.horizons_chunk_days:
+                chunks.append((str(start_date), str(end_date)))  # rango corto: la consulta no cambia
+                continue
+            while start <= end:
+                stop = min(start + timedelta(days=self.horizons_chunk_days - 1), end)
+                chunks.append((start.isoformat(), stop.isoformat()))
+                start = stop + timedelta(days=1)
+        return chunks
+
+    #Clave del objeto en el almacén de efemérides (los cometas usan otro comando de Horizons)
+    def _ephemeris_key(self, selected_object, object_type):
+        prefix = "DES" if object_type == 'Cometa' else "ID"
+        return f"{prefix}-{selected_object}"
+
+    #Archivo de comandos para la API de Horizons (None si el tipo de objeto no aplica)
+    def _horizons_input(self, selected_object, start_date, end_date, object_type, step='1 d'):
         # Comandos estilo archivo .api
         if object_type =='Cometa':
             # Comandos estilo archivo .api
@@ -253,7 +550,7 @@ class DATA:
             CENTER='500@399'
             START_TIME='{start_date}'
             STOP_TIME='{end_date}'
-            STEP_SIZE='1 d'
+            STEP_SIZE='{step}'
             QUANTITIES='1,19,20,43'
             !$$EOF
             """
@@ -268,109 +565,211 @@ class DATA:
             CENTER='500@399'
             START_TIME='{start_date}'
             STOP_TIME='{end_date}'
-            STEP_SIZE='1 d'
+            STEP_SIZE='{step}'
             QUANTITIES='1,19,20,43'
             !$$EOF
             """
         else:
             return None
+        return horizons_input
 
-        # Enviar como parámetro 'input'
-        response = requests.post(self.url_horizons, data={'input': horizons_input})
-        dataset = response.json()
+    #Clave de la caché: ignora la indentación del archivo de comandos
+    def _horizons_key(self, horizons_input):
+        return {"input": "\n".join(line.strip() for line in horizons_input.splitlines() if line.strip())}
+
+    #Horizons responde con texto de error (ej. "No matches found") en lugar de la tabla
+    def _check_horizons(self, raw_result):
+        if '$$SOE' not in raw_result or '$$EOE' not in raw_result:
+            raise RuntimeError(f"Horizons no devolvió una tabla de efemérides: {raw_result.strip()[:300]}")
+        return raw_result
+
+    #Lectura vectorizada del bloque $$SOE...$$EOE de Horizons
+    def _parse_ephemerides(self, raw_result, selected_object=None):
+        """
+        Convierte la tabla de ancho fijo de Horizons en un DataFrame de Polars.
+
+        Todo el bloque se procesa de una vez: las columnas se obtienen cortando
+        (str.slice) la serie completa de líneas, sin bucles fila a fila. Los campos
+        vacíos o "n.a." quedan como nulos en lugar de producir un error.
+        """
+        stage = "horizons_parse_process" if self._use_process_pool(raw_result) else "horizons_parse"
+        with trace_span(self.tracer, stage, object=selected_object, bytes=len(raw_result)) as span:
+            if stage == "horizons_parse_process":
+                df = from_ipc(get_process_pool(self.parse_workers).submit(_ephemerides_worker, raw_result).result())
+            else:
+                df = self._parse_ephemeris_table(raw_result)
+            span["rows_out"] = df.shape[0]
+        return df
 
-        # Paso 3: Extraer el contenido plano del resultado
-        raw_result = dataset["result"]
+    def _parse_ephemeris_table(self, raw_result):
+        self._check_horizons(raw_result)
         start_idx = raw_result.find('$$SOE')+6
         end_idx = raw_result.find('$$EOE')
-        lines = raw_result[start_idx:end_idx].splitlines()
+        lines = pl.Series("line", raw_result[start_idx:end_idx].splitlines(), dtype=pl.Utf8)
 
-        date, delta, r, alpha = [], [], [], []
-        for line in lines:
-          date  = np.append(date, line[1:12].strip())                #Fechas 
-          delta = np.append(delta, float(line[76:93].strip()))       #Distancia Tierra-objeto
-          r     = np.append(r, float(line[48:63].strip()))           #Distancia Sol-objeto
-          alpha = np.append(alpha, float(line[108:115].strip()))     #Angulo de fase
+        def field(start, stop):
+            # Columna de ancho fijo [start:stop] de todas las líneas
+            return pl.col("line").str.slice(start, stop - start).str.strip_chars()
 
-        date_datatime = pd.to_datetime(date, format='%Y-%b-%d',utc=True)
-        df = pd.DataFrame({'Date':date_datatime,'Delta':delta,'r':r,'Fase':alpha})
+        df = pl.DataFrame(lines).filter(pl.col("line").str.strip_chars() != "").select(
+            pl.coalesce(                                                                #Fechas (con hora si el paso es menor a un día)
+                field(1, 18).str.strptime(pl.Datetime("us"), "%Y-%b-%d %H:%M", strict=False),
+                field(1, 12).str.strptime(pl.Date, "%Y-%b-%d", strict=False).cast(pl.Datetime("us")),
+            ).dt.replace_time_zone("UTC").alias("Date"),
+            field(76, 93).cast(pl.Float64, strict=False).alias("Delta"),                #Distancia Tierra-objeto
+            field(48, 63).cast(pl.Float64, strict=False).alias("r"),                    #Distancia Sol-objeto
+            field(108, 115).cast(pl.Float64, strict=False).alias("Fase"),               #Angulo de fase
+        )
 
-        return pl.from_pandas(df)  # Devuelve el DataFrame con las efemerides seleccionadas ( date, delta, r, alpha)
+        # Se descartan las líneas cuya fecha no se pudo interpretar
+        return df.filter(pl.col("Date").is_not_null())
     
-    def observations_COBS(self,selected_comet,start_date,end_date):
+    def observations_COBS(self,selected_comet,start_date,end_date,workers=4):
         """
         Descarga observaciones de un cometa desde la API de COBS y devuelve un DataFrame.
+
+        La primera página indica cuántas hay en total; el resto se descarga en
+        paralelo. Si la API no informa el total, se piden por adelantado `workers`
+        páginas a la vez hasta encontrar la primera vacía. El rango de fechas se
+        envía en la consulta y cada página se convierte a Polars al llegar.
         
         Parámetros
         ----------
         selected_comet : str
             Nombre o designación del cometa (ejemplo: "C/2023 A3").
-        max_pages : int
-            Máximo número de páginas a descargar (por defecto 5).
+        start_date, end_date : str
+            Rango de fechas en formato 'YYYY-MM-DD'.
+        workers : int, opcional
+            Páginas que se descargan al mismo tiempo (por defecto 4).
         
         Retorna
         -------
-        pd.DataFrame
+        polars.DataFrame
             DataFrame con columnas: obsTime, Magn_obs
         """
-        all_obs = []
-        page = 1
-        while True:
-            url = (
-                    f"https://cobs.si/api/obs_list.api"
-                    f"?des={selected_comet}"
-                    f"&format=json"
-                    f"&from_date={start_date} 00:00"
-                    f"&page={page}"
-                    f"&exclude_faint=False"
-                    f"&exclude_not_accurate=False"
-                )
-            r = requests.get(url, timeout=15)
-            data = r.json()
-            
-            if not data.get("objects"):
-                break  # no hay más resultados
-        
-            all_obs.extend(data["objects"])
-            page += 1
-    
-            
-        if not all_obs:
-            return pl.DataFrame({"obsTime": [], "Magn_obs": []})
-        
-        df_pandas = pd.DataFrame(all_obs)
-            
+        def url(page):
+            return self._COBS_url(selected_comet, start_date, end_date, page)
+
+        first = self._fetch_COBS_page(url(1))
+        if not first.get("objects"):
+            return self._COBS_frame([], start_date, end_date)  # no hay resultados
+
+        frames = [self._COBS_page_frame(first["objects"])]
+        n_pages = self._COBS_page_count(first)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            if n_pages is not None:
+                # Total conocido: se piden todas las páginas restantes a la vez
+                for data in executor.map(self._fetch_COBS_page, [url(page) for page in range(2, n_pages + 1)]):
+                    if data.get("objects"):
+                        frames.append(self._COBS_page_frame(data["objects"]))
+            else:
+                # Total desconocido: ventana de páginas adelantadas hasta la primera vacía
+                pending = deque()
+                next_page = 2
+                while True:
+                    while len(pending) < max(1, workers):
+                        pending.append(executor.submit(self._fetch_COBS_page, url(next_page)))
+                        next_page += 1
+                    data = pending.popleft().result()
+                    if not data.get("objects"):
+                        break  # no hay más resultados
+                    frames.append(self._COBS_page_frame(data["objects"]))
+                for future in pending:
+                    future.cancel()
+
+        return self._COBS_frame(frames, start_date, end_date)
+
+    #URL de una página de observaciones de COBS
+    def _COBS_url(self, selected_comet, start_date, end_date, page):
+        return (
+                f"https://cobs.si/api/obs_list.api"
+                f"?des={selected_comet}"
+                f"&format=json"
+                f"&from_date={start_date} 00:00"
+                f"&to_date={end_date} 23:59"
+                f"&page={page}"
+                f"&exclude_faint=False"
+                f"&exclude_not_accurate=False"
+            )
+
+    #Descarga (o lectura desde la caché) de una página de COBS
+    def _fetch_COBS_page(self, url):
+        def fetch():
+            r = self.transport.get(url, timeout=15)
+            r.raise_for_status()
+            return r.content
+
+        with trace_span(self.tracer, "cobs_download", object=parse_qs(urlsplit(url).query).get("des", [None])[0]) as span:
+            content = cached_fetch(self.cache, "cobs_obs", {"url": url}, span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        return json.loads(content)
+
+    #Número total de páginas según la respuesta de COBS: campo info.pages de obs_list.api (None si no viene)
+    def _COBS_page_count(self, data):
+        info = data.get("info")
+        pages = info.get("pages") if isinstance(info, dict) else None
+        try:
+            return int(pages) if pages is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    #Página de COBS a Polars (solo fecha y magnitud)
+    def _COBS_page_frame(self, objects):
+        with trace_span(self.tracer, "cobs_parse", rows_in=len(objects)) as span:
+            df = self._COBS_page_table(objects)
+            span["rows_out"] = df.shape[0]
+        return df
+
+    def _COBS_page_table(self, objects):
+        df = pl.DataFrame({
+            "obsTime": [obs.get("obs_date") for obs in objects],
+            "Magn_obs": [None if obs.get("magnitude") is None else str(obs.get("magnitude")) for obs in objects],
+        }, schema={"obsTime": pl.Utf8, "Magn_obs": pl.Utf8})
+        return df.select(
+            self._parse_obs_times("obsTime"),
+            pl.col("Magn_obs").str.strip_chars().cast(pl.Float64, strict=False),
+        )
+
+    #Limpieza de las observaciones de COBS
+    def _COBS_frame(self, frames, start_date, end_date):
+        if not frames:
+            return pl.DataFrame(schema={"obsTime": pl.Datetime("us", "UTC"), "Magn_obs": pl.Float64})
         
         # Limpieza
-        df_pandas["obsTime"] = pd.to_datetime(df_pandas["obs_date"], errors="coerce", utc=True)
-        df_pandas["Magn_obs"] = pd.to_numeric(df_pandas["magnitude"], errors="coerce")
-    
-        df_polars = pl.from_pandas(df_pandas[["obsTime", "Magn_obs"]].dropna())
+        df_polars = pl.concat(frames).drop_nulls().filter(~pl.col("Magn_obs").is_nan())
 
         #Se restringe al rango de fechas especifico
-        df = df_polars.filter((pl.col('obsTime') >= pl.lit(start_date).str.strptime(df_polars.schema['obsTime'], strict=False)) &
-                           (pl.col('obsTime') <= pl.lit(end_date).str.strptime(df_polars.schema['obsTime'], strict=False)))
-        
-        return df
+        return self._date_filter(df_polars, start_date, end_date)
 
+    #Información del objeto (identificador y órbita), resuelta una sola vez por proceso
+    def _information(self, selected_object, info=None):
+        if info is not None:
+            return info
+        with trace_span(self.tracer, "information", object=selected_object) as span:
+            span["cache"] = "hit" if Information._registered(selected_object) is not None else "miss"
+            return Information.get(selected_object, cache=self.cache, transport=self.transport, tracer=self.tracer)
 
-    
-    def days_to_perihelion(self, df, selected_object):
-        T_peri = Information(selected_object).date_perihelion()
-        P = float(Information(selected_object).orbital_period())*365.25
+    def days_to_perihelion(self, df, selected_object, info=None):
+        info = self._information(selected_object, info)
+        T_peri = info.date_perihelion()
+        P = float(info.orbital_period())*365.25
         df = df.with_columns([((((pl.col("obsTime") - T_peri).dt.total_seconds())/86400 + P/2) % P - P/2).alias("t-Tq")])
         return df
     
-    def days_to_perihelion_exocomets(self, df, selected_object):
-        T_peri = Information(selected_object).date_perihelion()
+    def days_to_perihelion_exocomets(self, df, selected_object, info=None):
+        T_peri = self._information(selected_object, info).date_perihelion()
         df = df.with_columns([(((pl.col("obsTime") - T_peri).dt.total_seconds())/86400).alias("t-Tq")])
         return df
 
     def reduced_magnitude(self, df):
-        df = df.with_columns((pl.col("Magn_obs").cast(pl.Float64) - 5 * np.log10(pl.col("r") * pl.col("Delta"))).alias("Magn_redu"))
+        df = df.with_columns((pl.col("Magn_obs").cast(pl.Float64) - 5 * (pl.col("r") * pl.col("Delta")).log10()).alias("Magn_redu"))
         return df
 
     def organization_df(self, df):
+        return self._organize(df)
+
+    #Tabla final de la SLC; `extra` agrega columnas al inicio (ej. obsTime para el almacén)
+    def _organize(self, df, extra=()):
     
         df = df.with_columns([
                 # Año, mes, día fraccionado
@@ -393,57 +792,441 @@ class DATA:
                 pl.col("Magn_redu").round(2)
             ]) # Eliminamos la columna original
         
-        df = df.select(["Anio", "Mes", "Dia", "t-Tq", "Delta", "r", "Fase", "Magn_obs", "Magn_redu"])
+        df = df.select([*extra, "Anio", "Mes", "Dia", "t-Tq", "Delta", "r", "Fase", "Magn_obs", "Magn_redu"])
+        if self.compact:
+            df = df.cast(ESQUEMA_SLC_COMPACTO)
         return df    
 
-    def datos_SLC(self, selected_object,start_date, end_date, object_type):
-        df_obs = self.observations_MPC_clean(selected_object, start_date, end_date)
-        df_eph = self.get_ephemerides(selected_object,start_date, end_date, object_type)
+    def datos_SLC(self, selected_object,start_date, end_date, object_type, info=None, lazy=False,
+                  ephemeris_join="date", adaptive_step=False):
+        """
+        Datos de la curva de luz secular a partir de las observaciones del MPC.
 
-        # 1. Convertir las columnas datetime a solo fecha
-        if not df_obs.shape[0]:
-            return pl.DataFrame({"Anio": [], "Mes": [], "Dia": [], "t-Tq": [], "Delta": [], "r": [], "Fase": [], "Magn_obs": [], "Magn_redu": []})
-        
-        df_obs = df_obs.with_columns(
-            pl.col("obsTime").dt.date().alias("Date")
-        )
-        
-        df_eph = df_eph.with_columns(
-            pl.col("Date").dt.date().alias("Date")
-        )
-        
-        # 2. Hacer el join usando la nueva columna "Date"
-        df_join = df_obs.join(df_eph, on="Date", how="inner")
+        Las etapas de transformación (limpieza, corrección a banda V, unión con las
+        efemérides, t-Tq, magnitud reducida y organización) se arman como un único
+        plan perezoso de Polars, para que el optimizador empuje el filtro de fechas
+        y la proyección de columnas y evite tablas intermedias.
 
-        if object_type=='Objeto Interestelar':
-            df = self.organization_df(self.reduced_magnitude(self.days_to_perihelion_exocomets(df_join,selected_object))) 
-        else:
-            df = self.organization_df(self.reduced_magnitude(self.days_to_perihelion(df_join,selected_object))) 
-        return df   
+        Parámetros
+        ----------
+        selected_object : str
+            Identificador del objeto (ej. "Ceres").
+        start_date, end_date : str
+            Rango de fechas en formato 'YYYY-MM-DD'.
+        object_type : str
+            'Asteroide', 'Cometa' u 'Objeto Interestelar' (ver `Information.object_type`).
+        info : Information, opcional
+            Información del objeto ya construida. Si es None se usa `Information.get`,
+            que resuelve el identificador y la órbita una sola vez por proceso.
+        lazy : bool, opcional
+            Si es True devuelve el `LazyFrame` sin ejecutar, para agregar etapas
+            propias antes de `collect()`.
+        ephemeris_join : str, opcional
+            Cómo se asignan las efemérides a cada observación: "date" (por defecto,
+            misma fecha calendario), "asof" (fila más cercana), "linear" o "cubic"
+            (interpolación en el instante de la observación).
+        adaptive_step : bool, opcional
+            Si es True las efemérides se piden con paso fino solo donde la geometría
+            cambia rápido (ver `refine_ephemerides`). Requiere un `ephemeris_join`
+            distinto de "date".
+
+        Retorna
+        -------
+        polars.DataFrame o polars.LazyFrame
+            Columnas Anio, Mes, Dia, t-Tq, Delta, r, Fase, Magn_obs, Magn_redu.
+        """
+        df_raw = self._MPC_frame(self._fetch_MPC_xml(selected_object), ["obsTime", "mag", "band"], selected_object)
+        # Limpieza y corrección a banda V en un solo plan, ejecutado una única vez
+        with trace_span(self.tracer, "mpc_clean", object=selected_object, rows_in=df_raw.shape[0]) as span:
+            df_obs = self._clean_MPC(df_raw.lazy(), start_date, end_date).collect()
+            span["rows_out"] = df_obs.shape[0]
+        # Si no quedan observaciones no se consultan las efemérides
+        if not df_obs.shape[0]:
+            return self._empty_SLC().lazy() if lazy else self._empty_SLC()
+        df_eph = self._SLC_ephemerides(selected_object, start_date, end_date, object_type, df_obs,
+                                       ephemeris_join, adaptive_step)
+        lf = self._SLC_from_frames(df_obs.lazy(), df_eph.lazy(), selected_object, object_type, info,
+                                   ephemeris_join=ephemeris_join)
+        return lf if lazy else self._collect_SLC(lf, selected_object, rows_in=df_obs.shape[0])
     
-    def datos_SLC_COBS(self, selected_object,start_date, end_date, object_type):
+    def datos_SLC_COBS(self, selected_object,start_date, end_date, object_type, info=None, lazy=False,
+                       ephemeris_join="date", adaptive_step=False):
+        """
+        Igual que `datos_SLC` pero con las observaciones de cometas de COBS.
+        """
         df_obs = self.observations_COBS(selected_object, start_date, end_date)
-  
 
-        # 1. Convertir las columnas datetime a solo fecha
         if not df_obs.shape[0] or df_obs.select(pl.col("obsTime").is_null().any()).item():
-            return pl.DataFrame({"Anio": [], "Mes": [], "Dia": [], "t-Tq": [], "Delta": [], "r": [], "Fase": [], "Magn_obs": [], "Magn_redu": []})
-        else:
-            df_eph = self.get_ephemerides(selected_object,start_date, end_date, object_type)
-            df_obs = df_obs.filter(pl.col("obsTime").is_not_null())
+            return self._empty_SLC().lazy() if lazy else self._empty_SLC()
+        df_eph = self._SLC_ephemerides(selected_object, start_date, end_date, object_type, df_obs,
+                                       ephemeris_join, adaptive_step)
+        lf = self._SLC_from_frames(df_obs.lazy(), df_eph.lazy(), selected_object, object_type, info,
+                                   ephemeris_join=ephemeris_join)
+        return lf if lazy else self._collect_SLC(lf, selected_object, rows_in=df_obs.shape[0])
+
+    #Fecha final de las efemérides: un día más si se interpolan (observaciones del último día)
+    def _ephemeris_stop(self, end_date, ephemeris_join):
+        if ephemeris_join == "date":
+            return end_date
+        return (datetime.fromisoformat(str(end_date)[:10]) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    #Efemérides para la SLC según el tipo de unión con las observaciones
+    def _SLC_ephemerides(self, selected_object, start_date, end_date, object_type, df_obs,
+                         ephemeris_join="date", adaptive_step=False):
+        if ephemeris_join == "date":
+            if adaptive_step:
+                raise ValueError("adaptive_step requiere ephemeris_join 'asof', 'linear' o 'cubic'")
+            return self.get_ephemerides(selected_object, start_date, end_date, object_type)
+        df_eph = self.get_ephemerides(selected_object, start_date, self._ephemeris_stop(end_date, ephemeris_join),
+                                      object_type)
+        if adaptive_step:
+            obs_times = df_obs.lazy().select("obsTime").collect().to_series()
+            df_eph = self.refine_ephemerides(selected_object, df_eph, object_type, obs_times)
+        return df_eph
+
+    #Ejecuta el plan perezoso de la SLC (etapa "slc_transform" del tracer)
+    def _collect_SLC(self, lf, selected_object, rows_in=None):
+        with trace_span(self.tracer, "slc_transform", object=selected_object, rows_in=rows_in) as span:
+            df = lf.collect()
+            span["rows_out"] = df.shape[0]
+        return df
+
+    #Tabla vacía con las columnas de la SLC
+    def _empty_SLC(self):
+        df = pl.DataFrame({"Anio": [], "Mes": [], "Dia": [], "t-Tq": [], "Delta": [], "r": [], "Fase": [], "Magn_obs": [], "Magn_redu": []})
+        return df.cast(ESQUEMA_SLC_COMPACTO) if self.compact else df
+
+    #Une observaciones y efemérides ya descargadas y arma la tabla de la SLC
+    #(DataFrame o LazyFrame, según la entrada)
+    def _SLC_from_frames(self, df_obs, df_eph, selected_object, object_type, info=None, extra=(),
+                         ephemeris_join="date"):
+        if isinstance(df_obs, pl.DataFrame) and not df_obs.shape[0]:
+            return self._empty_SLC()
+
+        df_obs = df_obs.filter(pl.col("obsTime").is_not_null())
+        # Filas de efemérides sin geometría (campos vacíos o "n.a." de Horizons) se descartan
+        # antes de cualquier unión, igual para "date", "asof" y la interpolación
+        df_eph = self._same_kind(df_eph, df_obs).drop_nulls(subset=["Date", "Delta", "r", "Fase"])
+        if ephemeris_join == "date":
+            # 1. Convertir las columnas datetime a solo fecha
             df_obs = df_obs.with_columns(
                 pl.col("obsTime").dt.date().alias("Date")
             )
-            df_eph = df_eph.filter(pl.col("Date").is_not_null())
             df_eph = df_eph.with_columns(
                 pl.col("Date").dt.date().alias("Date")
             )
-            
+
             # 2. Hacer el join usando la nueva columna "Date"
             df_join = df_obs.join(df_eph, on="Date", how="inner")
+        else:
+            df_join = self._join_ephemerides(df_obs, df_eph, ephemeris_join)
+
+        if object_type=='Objeto Interestelar':
+            df = self._organize(self.reduced_magnitude(self.days_to_perihelion_exocomets(df_join,selected_object,info)), extra) 
+        else:
+            df = self._organize(self.reduced_magnitude(self.days_to_perihelion(df_join,selected_object,info)), extra) 
+        return df
+
+    #---------------Unión con las efemérides en el instante de observación----------------
+    def _join_ephemerides(self, df_obs, df_eph, method):
+        """
+        Valores de Delta, r y Fase en el instante exacto de cada observación.
+
+        - "asof": fila de efemérides más cercana (a lo sumo a un día).
+        - "linear": interpolación lineal en el tiempo entre las filas vecinas.
+        - "cubic": interpolación cúbica de Hermite con pendientes por diferencias
+          centradas (continua en valor y derivada).
+
+        Todo se resuelve con `join_asof` sobre las efemérides ordenadas, sin bucles
+        fila a fila. Las observaciones fuera del rango de las efemérides se descartan.
+        """
+        columns = ["Delta", "r", "Fase"]
+        df_obs = df_obs.sort("obsTime")
+        df_eph = df_eph.select(["Date", *columns]).sort("Date")
+
+        if method == "asof":
+            return df_obs.join_asof(df_eph, left_on="obsTime", right_on="Date", strategy="nearest",
+                                    tolerance="1d").drop_nulls(subset=columns).drop("Date")
+        if method not in ("linear", "cubic"):
+            raise ValueError(f"ephemeris_join debe ser 'date', 'asof', 'linear' o 'cubic', no {method!r}")
+
+        # Pendiente de cada columna (por microsegundo) en cada fila de las efemérides
+        t = pl.col("Date").dt.epoch("us").cast(pl.Float64)
+        slopes = [((pl.col(c).shift(-1).fill_null(pl.col(c)) - pl.col(c).shift(1).fill_null(pl.col(c)))
+                   / (t.shift(-1).fill_null(t) - t.shift(1).fill_null(t))).fill_nan(0.0).alias(f"m_{c}")
+                  for c in columns]
+        df_eph = df_eph.with_columns(slopes)
+
+        def side(suffix):
+            return df_eph.select([pl.col("Date").alias(f"Date{suffix}"),
+                                  *(pl.col(c).alias(f"{c}{suffix}") for c in columns),
+                                  *(pl.col(f"m_{c}").alias(f"m_{c}{suffix}") for c in columns)])
+
+        # Filas vecinas anterior (_0) y posterior (_1) de cada observación
+        df = (df_obs.join_asof(side("_0"), left_on="obsTime", right_on="Date_0", strategy="backward")
+                    .join_asof(side("_1"), left_on="obsTime", right_on="Date_1", strategy="forward")
+                    .filter(pl.col("Date_0").is_not_null() & pl.col("Date_1").is_not_null()))
+
+        h = (pl.col("Date_1") - pl.col("Date_0")).dt.total_microseconds().cast(pl.Float64)
+        s = pl.when(h > 0).then((pl.col("obsTime") - pl.col("Date_0")).dt.total_microseconds() / h).otherwise(0.0)
+        if method == "linear":
+            values = [(pl.col(f"{c}_0") + s * (pl.col(f"{c}_1") - pl.col(f"{c}_0"))).alias(c) for c in columns]
+        else:
+            h00 = 2 * s**3 - 3 * s**2 + 1
+            h10 = s**3 - 2 * s**2 + s
+            h01 = -2 * s**3 + 3 * s**2
+            h11 = s**3 - s**2
+            values = [(h00 * pl.col(f"{c}_0") + h10 * h * pl.col(f"m_{c}_0")
+                       + h01 * pl.col(f"{c}_1") + h11 * h * pl.col(f"m_{c}_1")).alias(c) for c in columns]
+        return df.with_columns(values).select([*df_obs.collect_schema().names(), *columns])
+
+    def refine_ephemerides(self, selected_object, df_eph, object_type, obs_times=None):
+        """
+        Refina las efemérides diarias donde la geometría cambia rápido.
+
+        Los días en que Delta cambia más de `refine_delta_tol` (relativo) o la fase
+        más de `refine_phase_tol` grados (ej. acercamientos de NEOs) se vuelven a
+        pedir a Horizons con paso `refine_step`; el resto conserva el paso diario.
+        Si se indican `obs_times`, solo se refinan los días con observaciones.
 
-            if object_type=='Objeto Interestelar':
-                df = self.organization_df(self.reduced_magnitude(self.days_to_perihelion_exocomets(df_join,selected_object))) 
+        Retorna
+        -------
+        polars.DataFrame
+            Efemérides con el paso diario reemplazado por el fino en esos tramos.
+        """
+        df_eph = df_eph.filter(pl.col("Date").is_not_null()).sort("Date")
+        if df_eph.shape[0] < 2:
+            return df_eph
+        fast = df_eph.select(
+            ((pl.col("Delta").diff().abs() / pl.col("Delta")) > self.refine_delta_tol)
+            | (pl.col("Fase").diff().abs() > self.refine_phase_tol)
+        ).to_series().fill_null(False).to_numpy()
+
+        dates = df_eph["Date"].dt.epoch("us").to_numpy()
+        if obs_times is not None:
+            # Solo los tramos (fila anterior, fila i] que contienen observaciones
+            t = np.sort(obs_times.drop_nulls().dt.epoch("us").to_numpy())
+            counts = np.searchsorted(t, dates, side="right") - np.searchsorted(t, np.roll(dates, 1), side="right")
+            fast &= counts > 0
+
+        # Tramos consecutivos a refinar: [fecha de la fila anterior, fecha de la última fila rápida]
+        spans = []
+        for i in np.flatnonzero(fast).tolist():
+            if spans and spans[-1][1] == i - 1:
+                spans[-1][1] = i
             else:
-                df = self.organization_df(self.reduced_magnitude(self.days_to_perihelion(df_join,selected_object))) 
-            return df  
+                spans.append([i - 1, i])
+        if not spans:
+            return df_eph
+
+        frames = [df_eph]
+        for first, last in spans:
+            start = df_eph["Date"][first].strftime("%Y-%m-%d %H:%M")
+            stop = df_eph["Date"][last].strftime("%Y-%m-%d %H:%M")
+            frames.append(self._fetch_ephemerides(selected_object, start, stop, object_type, self.refine_step))
+        # Las filas finas reemplazan a las diarias de la misma fecha y hora
+        return pl.concat(frames[1:] + frames[:1]).unique("Date", keep="first").sort("Date")
+
+    #---------------Actualización incremental----------------
+    def _store_key(self, selected_object, info):
+        # Clave del objeto en el almacén: permid del MPC si existe
+        return info.ID_object() or info.provisional_designation() or str(selected_object).strip()
+
+    def refresh_observations(self, selected_object, store, source="MPC", start_date="1800-01-01", info=None):
+        """
+        Descarga las observaciones del objeto y agrega al almacén solo las nuevas.
+
+        Para COBS solo se consulta desde el día de la última observación guardada.
+        La API del MPC no permite filtrar por fecha, así que se descarga el
+        historial completo, pero solo se agregan las observaciones que no estaban
+        (también las que el MPC incorpora con fechas antiguas).
+
+        Parámetros
+        ----------
+        selected_object : str
+            Identificador del objeto.
+        store : ObservationStore
+            Almacén local de observaciones.
+        source : str, opcional
+            "MPC" (por defecto) o "COBS".
+        start_date : str, opcional
+            Fecha inicial de la primera descarga de COBS (sin datos previos).
+        info : Information, opcional
+            Información del objeto ya construida.
+
+        Retorna
+        -------
+        polars.DataFrame
+            Observaciones que no estaban en el almacén.
+        """
+        info = self._information(selected_object, info)
+        key = self._store_key(selected_object, info)
+        return store.append(source, key, self._pending_observations(selected_object, store, source, start_date, info), "obs")
+
+    #Observaciones descargadas que todavía no están en el almacén (no guarda nada)
+    def _pending_observations(self, selected_object, store, source, start_date, info):
+        key = self._store_key(selected_object, info)
+        if source == "COBS":
+            last = store.last_obs_time("COBS", key)
+            from_date = last.strftime("%Y-%m-%d") if last is not None else start_date
+            to_date = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d")
+            df = self.observations_COBS(selected_object, from_date, to_date)
+        else:
+            df = self._MPC_frame(self._fetch_MPC_xml(selected_object), ["obsTime", "mag", "band"], selected_object)
+            df = df.drop_nulls(subset=["obsTime", "mag"]).with_columns([pl.col("mag").cast(pl.Float64, strict=False),
+                                                                       pl.col("band").cast(pl.Utf8)])
+        return store.new_rows(source, key, df, "obs")
+
+    def datos_SLC_refresh(self, selected_object, object_type, store, start_date=None, end_date=None,
+                          source="MPC", info=None):
+        """
+        Actualiza los datos de la SLC de un objeto calculando solo las filas nuevas.
+
+        Las observaciones nuevas (ver `refresh_observations`) se corrigen, se unen
+        a las efemérides de su propio rango de fechas y se agregan a la SLC
+        guardada. Las filas calculadas en ejecuciones anteriores no se recalculan.
+
+        Parámetros
+        ----------
+        selected_object : str
+            Identificador del objeto.
+        object_type : str
+            'Asteroide', 'Cometa' u 'Objeto Interestelar'.
+        store : ObservationStore
+            Almacén local de observaciones y resultados.
+        start_date, end_date : str, opcional
+            Rango de fechas 'YYYY-MM-DD' de las filas devueltas (todas si es None).
+        source : str, opcional
+            "MPC" (por defecto, usa `datos_SLC`) o "COBS" (usa `datos_SLC_COBS`).
+        info : Information, opcional
+            Información del objeto ya construida.
+
+        Retorna
+        -------
+        polars.DataFrame
+            Columnas Anio, Mes, Dia, t-Tq, Delta, r, Fase, Magn_obs, Magn_redu.
+        """
+        info = self._information(selected_object, info)
+        key = self._store_key(selected_object, info)
+
+        df_new = self._pending_observations(selected_object, store, source, start_date or "1800-01-01", info)
+        df_obs = df_new if source == "COBS" else self.V_band_correction(df_new)
+        if df_obs.shape[0]:
+            # Efemérides solo del rango de fechas de las observaciones nuevas
+            first = df_obs["obsTime"].min().strftime("%Y-%m-%d")
+            last = (df_obs["obsTime"].max() + timedelta(days=1)).strftime("%Y-%m-%d")
+            df_eph = self.get_ephemerides(selected_object, first, last, object_type)
+            slc_new = self._SLC_from_frames(df_obs, df_eph, selected_object, object_type, info, extra=("obsTime",))
+            store.append(source, key, slc_new, "slc")
+        # Las observaciones se guardan al final: si algo falla antes, la próxima
+        # actualización las vuelve a encontrar como nuevas y calcula su SLC
+        if df_new.shape[0]:
+            store.append(source, key, df_new, "obs")
+
+        df = store.load(source, key, "slc")
+        if df is None:
+            return self._empty_SLC()
+        if start_date is not None:
+            df = df.filter(pl.col("obsTime") >= pl.lit(start_date).str.strptime(df.schema["obsTime"], strict=False))
+        if end_date is not None:
+            df = df.filter(pl.col("obsTime") <= pl.lit(end_date).str.strptime(df.schema["obsTime"], strict=False))
+        return df.drop("obsTime")
+
+    #---------------Varios objetos a la vez----------------
+    #Fuente de la SLC con source="auto": COBS para cometas (e interestelares) que están en COBS, MPC para el resto
+    def _SLC_source(self, selected_object, info, source="auto"):
+        if source != "auto":
+            return source
+        if info.object_type() in ('Cometa', 'Objeto Interestelar') and info.comet_exists_in_COBS(selected_object):
+            return "COBS"
+        return "MPC"
+
+    def _datos_SLC_object(self, selected_object, start_date, end_date, source, dataset=None):
+        # Resuelve el tipo de objeto y calcula su SLC con la fuente indicada
+        info = self._information(selected_object)
+        if info._lookup_failed:
+            # Error de red u otro fallo transitorio: no es lo mismo que un objeto inexistente
+            raise RuntimeError(f"Falló la consulta del identificador de '{selected_object}' en el MPC (se puede reintentar)")
+        object_type = info.object_type()
+        if object_type is None:
+            raise RuntimeError(f"El objeto '{selected_object}' no se encontró en el MPC")
+        source = self._SLC_source(selected_object, info, source)
+        if source == "COBS":
+            df = self.datos_SLC_COBS(selected_object, start_date, end_date, object_type, info=info)
+        else:
+            df = self.datos_SLC(selected_object, start_date, end_date, object_type, info=info)
+        if dataset is not None:
+            dataset.write_info(df, info, source, key=self._store_key(selected_object, info))
+        return df
+
+    def datos_SLC_many(self, objects, start_date, end_date, max_workers=8, rate_limits=None, source="MPC",
+                       dataset=None):
+        """
+        Calcula los datos de la SLC de muchos objetos de forma concurrente.
+
+        Las descargas (MPC, Horizons, identificador y órbita) de distintos objetos
+        se hacen en paralelo con un número acotado de hilos. Los resultados se
+        entregan a medida que cada objeto termina, y un error en un objeto no
+        detiene al resto.
+
+        Parámetros
+        ----------
+        objects : iterable of str
+            Identificadores de los objetos (ej. los miembros de una familia).
+        start_date, end_date : str
+            Rango de fechas en formato 'YYYY-MM-DD'.
+        max_workers : int, opcional
+            Número máximo de objetos procesados a la vez (por defecto 8).
+        rate_limits : dict, opcional
+            Consultas por segundo por host, ej. {"data.minorplanetcenter.net": 5}.
+            Se aplican al transporte de esta instancia solo mientras dura la
+            llamada; al terminar se restauran los límites anteriores (por defecto
+            el transporte es el compartido por todo el proceso).
+        source : str, opcional
+            "MPC" (por defecto) usa `datos_SLC`; "COBS" usa `datos_SLC_COBS`;
+            "auto" elige por objeto según `Information.object_type`: COBS para
+            los cometas que están en COBS y MPC para el resto.
+        dataset : SLCDataset, opcional
+            Si se indica, cada resultado se guarda en el conjunto Parquet
+            particionado apenas termina.
+
+        Retorna
+        -------
+        generator of (str, polars.DataFrame or None, Exception or None)
+            Tuplas (objeto, datos, error) en el orden en que terminan.
+
+        Ejemplo
+        --------
+        >>> for obj, df, error in DATA().datos_SLC_many(["153", "1038"], "2000-01-01", "2024-01-01"):
+        ...     if error is None:
+        ...         print(obj, df.shape)
+        """
+        previous_limits = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for host, rate in (rate_limits or {}).items():
+                previous_limits[host] = self.transport.rate_limit(host)
+                self.transport.set_rate_limit(host, rate)
+            futures = {executor.submit(self._datos_SLC_object, obj, start_date, end_date, source, dataset): obj
+                       for obj in objects}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+        finally:
+            # Si el generador se abandona, se cancelan los objetos pendientes
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Se restauran los límites que había antes de la llamada
+            for host, rate in previous_limits.items():
+                self.transport.set_rate_limit(host, rate)
+
+
+#---------------Lectura en procesos aparte (ver DATA.parse_workers)----------------
+def _MPC_frame_worker(xml_string, fields, output_format):
+    # Se ejecuta en el proceso hijo: lee el XML y devuelve la tabla como Arrow IPC
+    return to_ipc(DATA(output_format)._MPC_frame(xml_string, fields))
+
+
+def _ephemerides_worker(raw_result):
+    return to_ipc(DATA()._parse_ephemeris_table(raw_result))
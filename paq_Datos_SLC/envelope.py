@@ -0,0 +1,82 @@
+import polars as pl
+
+
+def _percentile_name(q):
+    # 0.05 -> "p05", 0.5 -> "p50", 0.975 -> "p97.5"
+    value = q * 100
+    return f"p{int(value):02d}" if value == int(value) else f"p{value:g}"
+
+
+def SLC_envelope(df, bin_width=1.0, by=None, magnitude="Magn_redu", percentiles=(0.05, 0.5, 0.95),
+                 origin=0.0, min_count=1):
+    """
+    Envolvente de la curva de luz secular por intervalos de t-Tq (una sola agrupación).
+
+    Toma la tabla de `datos_SLC` / `organization_df` (o varias concatenadas,
+    o lo leído con `SLCDataset.scan`), reparte las observaciones en
+    intervalos de `bin_width` días respecto del perihelio y calcula en cada
+    uno la magnitud más brillante (la envolvente), los percentiles pedidos y
+    la cantidad de observaciones. Con `by` (ej. "permid" u "object") se
+    calcula la de muchos objetos a la vez.
+
+    Parámetros
+    ----------
+    df : polars.DataFrame o polars.LazyFrame
+        Observaciones con las columnas "t-Tq" y `magnitude`.
+    bin_width : float, opcional
+        Ancho de cada intervalo en días (por defecto 1).
+    by : str o list of str, opcional
+        Columnas que identifican a cada objeto (por defecto uno solo).
+    magnitude : str, opcional
+        Magnitud usada (por defecto "Magn_redu"; también "Magn_obs").
+    percentiles : sequence of float, opcional
+        Cuantiles entre 0 y 1 que se calculan en cada intervalo
+        (columnas "p05", "p50", ...).
+    origin : float, opcional
+        t-Tq donde empieza un intervalo (por defecto 0, el perihelio).
+    min_count : int, opcional
+        Cantidad mínima de observaciones para conservar un intervalo.
+
+    Retorna
+    -------
+    polars.DataFrame o polars.LazyFrame (el mismo tipo de la entrada)
+        Una fila por objeto e intervalo, ordenada por t-Tq, con las columnas
+        `by`, "bin", "t-Tq_start", "t-Tq_center", "n", "envelope" (magnitud
+        mínima), "t-Tq_envelope" (t-Tq de esa observación) y los percentiles.
+
+    Excepciones
+    -----------
+    ValueError
+        Si `bin_width` no es positivo o algún percentil está fuera de [0, 1].
+
+    Ejemplo
+    --------
+    >>> frames = [mpc.datos_SLC(o, "2000-01-01", "2025-01-01", "Asteroide").with_columns(pl.lit(o).alias("permid"))
+    ...           for o in ["433", "1036"]]
+    >>> SLC_envelope(pl.concat(frames), bin_width=5, by="permid")
+    """
+    if not bin_width > 0:
+        raise ValueError(f"bin_width debe ser positivo: {bin_width}")
+    if any(not 0 <= q <= 1 for q in percentiles):
+        raise ValueError(f"Los percentiles deben estar entre 0 y 1: {percentiles}")
+    keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+
+    lf = df.lazy() if isinstance(df, pl.DataFrame) else df
+    mag = pl.col(magnitude)
+    lf = lf.select(*keys, pl.col("t-Tq"), mag.cast(pl.Float64)) \
+        .filter(mag.is_finite() & pl.col("t-Tq").is_finite()) \
+        .with_columns(((pl.col("t-Tq") - origin) / bin_width).floor().cast(pl.Int64).alias("bin"))
+
+    lf = lf.group_by([*keys, "bin"]).agg(
+        pl.len().alias("n"),
+        mag.min().alias("envelope"),
+        pl.col("t-Tq").sort_by(mag).first().alias("t-Tq_envelope"),
+        *[mag.quantile(q, interpolation="linear").alias(_percentile_name(q)) for q in percentiles],
+    ).filter(pl.col("n") >= min_count)
+
+    start = pl.col("bin") * bin_width + origin
+    lf = lf.with_columns(start.alias("t-Tq_start"), (start + bin_width / 2).alias("t-Tq_center")) \
+        .select(*keys, "bin", "t-Tq_start", "t-Tq_center", "n", "envelope", "t-Tq_envelope",
+                *[_percentile_name(q) for q in percentiles]) \
+        .sort([*keys, "bin"])
+    return lf.collect() if isinstance(df, pl.DataFrame) else lf
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+import importlib.resources as pkg_resources
+import numpy as np
+import polars as pl
+from .cache import default_cache_dir
+
+
+class FamilyIndex(Mapping):
+    """
+    Índice compacto de familias de asteroides construido a partir de family.json.
+
+    Guarda los permid numéricos ordenados en un arreglo int64 y la familia de
+    cada uno como un código entero (categórico) con su tabla de nombres. Las
+    búsquedas son O(log n) por búsqueda binaria y el índice se guarda en disco
+    la primera vez, de modo que las siguientes cargas solo mapean los arreglos
+    en memoria (sin volver a leer el JSON).
+
+    Se comporta como un diccionario de solo lectura {permid: familia}, igual que
+    el contenido de family.json.
+
+    Ejemplo
+    --------
+    >>> index = get_family_index()
+    >>> index.family("153")
+    'hilda'
+    >>> index.members("hilda")[:3]
+    array([ 153, 1038, 1212])
+    """
+
+    def __init__(self, permids, codes, names):
+        self.permids = permids  # int64 ordenados
+        self.codes = codes      # código de familia de cada permid
+        self.names = list(names)
+        self._codes_by_name = {name: i for i, name in enumerate(self.names)}
+        # Tabla código -> nombre; el último elemento (código -1) es "sin familia"
+        self._lookup_names = np.array(self.names + [None], dtype=object)
+
+    #---------------Construcción y carga----------------
+    @classmethod
+    def from_dict(cls, families):
+        names = sorted(set(families.values()))
+        codes_by_name = {name: i for i, name in enumerate(names)}
+        permids = np.fromiter((int(k) for k in families), dtype=np.int64, count=len(families))
+        codes = np.fromiter((codes_by_name[v] for v in families.values()), dtype=np.int64, count=len(families))
+        order = np.argsort(permids, kind="stable")
+        code_dtype = np.uint8 if len(names) < 256 else np.uint16
+        return cls(permids[order], codes[order].astype(code_dtype), names)
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "permids.npy", self.permids)
+        np.save(directory / "codes.npy", self.codes)
+        with open(directory / "names.json", "w", encoding="utf-8") as f:
+            json.dump(self.names, f)
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        with open(directory / "names.json", "r", encoding="utf-8") as f:
+            names = json.load(f)
+        return cls(np.load(directory / "permids.npy", mmap_mode="r"),
+                   np.load(directory / "codes.npy", mmap_mode="r"), names)
+
+    #---------------Búsquedas----------------
+    def _position(self, permid):
+        # Posición del permid en el índice o -1 si no está
+        key = str(permid).strip() if permid is not None else ""
+        if not key.isdigit():
+            return -1
+        value = int(key)
+        i = int(np.searchsorted(self.permids, value))
+        if i < len(self.permids) and self.permids[i] == value:
+            return i
+        return -1
+
+    def family(self, permid):
+        """
+        Familia del objeto (None si no pertenece a ninguna).
+        """
+        i = self._position(permid)
+        return self.names[self.codes[i]] if i >= 0 else None
+
+    def codes_many(self, permids):
+        """
+        Códigos de familia de muchos permid a la vez (-1 si no tienen familia).
+        """
+        values = permids if isinstance(permids, pl.Series) else pl.Series(permids, strict=False)
+        values = values.cast(pl.Utf8).str.strip_chars().cast(pl.Int64, strict=False)
+        values = values.fill_null(-1).to_numpy()
+        pos = np.searchsorted(self.permids, values)
+        pos = np.minimum(pos, len(self.permids) - 1)
+        found = self.permids[pos] == values
+        return np.where(found, self.codes[pos].astype(np.int64), -1)
+
+    def lookup_many(self, permids):
+        """
+        Familia de cada permid de una columna completa (búsqueda vectorizada).
+
+        Retorna
+        -------
+        polars.Series
+            Serie "family" con el nombre de la familia o nulo.
+        """
+        return pl.Series("family", self._lookup_names[self.codes_many(permids)], dtype=pl.Utf8)
+
+    def members(self, family):
+        """
+        Permid (int64) de todos los miembros de una familia.
+        """
+        code = self._codes_by_name.get(family)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.asarray(self.permids[self.codes == code])
+
+    def families(self):
+        return list(self.names)
+
+    #---------------Interfaz de diccionario----------------
+    def __getitem__(self, permid):
+        i = self._position(permid)
+        if i < 0:
+            raise KeyError(permid)
+        return self.names[self.codes[i]]
+
+    def __contains__(self, permid):
+        return self._position(permid) >= 0
+
+    def __iter__(self):
+        return (str(p) for p in self.permids)
+
+    def __len__(self):
+        return len(self.permids)
+
+
+#---------------Índice compartido por todas las instancias----------------
+_family_index = None
+_family_lock = threading.Lock()
+
+
+def _index_dir(source):
+    # El índice guardado se invalida si cambia family.json (tamaño o fecha)
+    stat = os.stat(source)
+    return default_cache_dir() / "family_index" / f"{stat.st_size}-{int(stat.st_mtime)}"
+
+
+def _build_family_index():
+    resource = pkg_resources.files(__package__).joinpath("family.json")
+    try:
+        directory = _index_dir(resource)
+        if (directory / "names.json").exists():
+            return FamilyIndex.load(directory)
+    except (OSError, TypeError, ValueError):
+        directory = None
+
+    # Primera vez: se lee el JSON y se guarda el índice compacto
+    with resource.open("r", encoding="utf-8") as f:
+        index = FamilyIndex.from_dict(json.load(f))
+    if directory is not None:
+        # Se guarda en un directorio temporal y se renombra (atómico entre procesos)
+        tmp = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        try:
+            index.save(tmp)
+            os.replace(tmp, directory)
+        except OSError:
+            # Sin permisos de escritura u otro proceso se adelantó: el índice queda en memoria
+            shutil.rmtree(tmp, ignore_errors=True)
+    return index
+
+
+def get_family_index():
+    """
+    Índice de familias compartido por el proceso (se construye o carga en el primer uso).
+    """
+    global _family_index
+    with _family_lock:
+        if _family_index is None:
+            _family_index = _build_family_index()
+        return _family_index
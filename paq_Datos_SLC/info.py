@@ -1,17 +1,41 @@
-import importlib.resources as pkg_resources
-import requests
 import json
-from astroquery.mpc import MPC
-from datetime import datetime, timedelta
-import pandas as pd
-import polars as pl
+import threading
+from datetime import datetime, timedelta, timezone
+from .cache import CacheMissError, cached_fetch
+from .trace import trace_span
+from .family import get_family_index
+from .cobs import get_COBS_catalog
 
 class Information:
     """
     Clase que busca información general sobre objetos menores del sistema solar.
+
+    Parámetros
+    ----------
+    selected_object : str
+        Identificador del objeto (ej. "Ceres", "433", "1P").
+    cache : ResponseCache, opcional
+        Caché en disco de las consultas al MPC y COBS (normalmente la misma de `DATA`).
+    transport : Transport, opcional
+        Transporte HTTP compartido (por defecto el transporte del proceso).
+    tracer : callable, opcional
+        Recibe la medición de cada consulta (identificador y órbita), ver `TraceSummary`.
     """
-    def __init__(self, selected_object: str):
+    # URL base de las consultas de identificadores y órbitas
+    url_identifier = "https://data.minorplanetcenter.net/api/query-identifier"
+    url_COBS_comet = "https://cobs.si/api/comet.api"
+
+    # Registro del proceso con los objetos ya resueltos (ver Information.get)
+    _registry = {}
+    _registry_lock = threading.Lock()
+    # True si la consulta del identificador falló (error de red, etc.): la instancia no se registra
+    _lookup_failed = False
+
+    def __init__(self, selected_object: str, cache=None, transport=None, tracer=None):
         self.selected_object = selected_object
+        self.cache = cache
+        self.transport = transport
+        self.tracer = tracer
         self.families = None
         self._load_families()
         self.identifier = None  
@@ -19,28 +43,109 @@ class Information:
         self.orbit_data = None
         self._fetch_orbit_data()
         
-    # método privado para cargar diccionario con todas las familias
+    #----------------Registro de objetos ya resueltos------------------
+    @classmethod
+    def get(cls, selected_object, cache=None, transport=None, tracer=None):
+        """
+        Devuelve la instancia de `Information` del objeto, construyéndola solo la
+        primera vez que se pide en el proceso.
+
+        El identificador del MPC y los elementos orbitales se resuelven una única
+        vez por objeto; las llamadas siguientes reutilizan la misma instancia
+        (con la caché y el transporte con los que se creó). Si la consulta del
+        identificador falló, la instancia se devuelve pero no se registra, para
+        que la próxima llamada vuelva a intentarlo.
+
+        Ejemplo
+        --------
+        >>> info = Information.get("Ceres")
+        >>> Information.get("Ceres") is info
+        True
+        """
+        info = cls._registered(selected_object)
+        if info is None:
+            info = cls(selected_object, cache=cache, transport=transport, tracer=tracer)
+            if not info._lookup_failed:
+                info = cls.register(info)
+        return info
+
+    @classmethod
+    def _registered(cls, selected_object):
+        with cls._registry_lock:
+            return cls._registry.get(str(selected_object).strip())
+
+    @classmethod
+    def register(cls, info):
+        # Guarda una instancia ya resuelta; si otro hilo se adelantó se conserva la primera
+        with cls._registry_lock:
+            return cls._registry.setdefault(str(info.selected_object).strip(), info)
+
+    @classmethod
+    def from_data(cls, selected_object, identifier, orbit_data, cache=None, transport=None, tracer=None):
+        """
+        Construye la instancia a partir de un identificador y una órbita ya
+        descargados (ej. por el cliente asíncrono), sin hacer consultas.
+        """
+        info = cls.__new__(cls)
+        info.selected_object = selected_object
+        info.cache = cache
+        info.transport = transport
+        info.tracer = tracer
+        info.families = None
+        info._load_families()
+        info.identifier = identifier
+        info.orbit_data = orbit_data
+        return info
+
+    @classmethod
+    def clear_registry(cls):
+        # Olvida los objetos resueltos (ej. para forzar una nueva consulta de la órbita)
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    #---------------Transporte HTTP (el compartido del proceso se crea al primer uso)----------------
+    @property
+    def transport(self):
+        if self._transport is None:
+            # requests se importa recién cuando hace falta consultar la red
+            from .transport import default_transport
+            self._transport = default_transport()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = transport
+
+    # método privado para cargar el índice con todas las familias
     def _load_families(self):
-        # Abre family.json directamente desde el paquete, sin importar dónde esté instalado
-        with pkg_resources.files(__package__).joinpath("family.json").open("r", encoding="utf-8") as f:
-            self.families = json.load(f)
+        # Índice compacto de family.json, compartido por todas las instancias
+        self.families = get_family_index()
             
     #método privado que hace la consulta de la información del MPC
+    def _query_identifier(self, identifier):
+        def fetch():
+            response = self.transport.get(self.url_identifier,  data=identifier)
+            response.raise_for_status()
+            return response.content
+
+        with trace_span(self.tracer, "mpc_identifier", object=identifier) as span:
+            content = cached_fetch(self.cache, "mpc_identifier", {"id": str(identifier).strip()}, span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        return json.loads(content)
+
     def _fetch_identifier(self):
-        url = "https://data.minorplanetcenter.net/api/query-identifier"
         try:
-            response = requests.get(url,  data=self.selected_object)
-            response.raise_for_status()
-            self.identifier = response.json()
+            self.identifier = self._query_identifier(self.selected_object)
+        except CacheMissError:
+            raise  # Modo offline sin la respuesta en caché: no es lo mismo que "no existe"
         except Exception as e:
             self.identifier = {"found": 0}  # fallback si hay error
+            self._lookup_failed = True
 
         #Para objetos con un identificador igual, se toma el primero
         disambiguation_list = self.identifier.get("disambiguation_list")
         if disambiguation_list:
-            response = requests.get(url,  data=disambiguation_list[0]['permid'])
-            response.raise_for_status()
-            self.identifier = response.json()     
+            self.identifier = self._query_identifier(disambiguation_list[0]['permid'])
 
     #--------------Buscar si el objeto esta en la base de datos del MPC------------------------
     def object_exists(self):
@@ -93,35 +198,66 @@ class Information:
     
     #------------------familia----------------------
     def family_object(self):
-        if self.ID_object() in self.families.keys():
-            return self.families[self.ID_object()]
-        else:
-            return None
+        return self.families.family(self.ID_object())
     #----------------------
     #
     #método privado que hace la consulta de la información del MPC
-    def _fetch_orbit_data(self):
+    def _query_orbit(self, target_type, **kwargs):
+        # Consulta de elementos orbitales con astroquery; se guarda en caché como JSON
+        def fetch():
+            # astroquery (y astropy) se importan solo al consultar una órbita
+            from astroquery.mpc import MPCClass
+
+            # astroquery usa su propia sesión; se le monta el pool y los reintentos del transporte
+            mpc = MPCClass()
+            self.transport.mount(mpc._session)
+            return json.dumps(mpc.query_object(target_type, **kwargs)[0], default=str).encode("utf-8")
+
+        with trace_span(self.tracer, "mpc_orbit", object=self.selected_object) as span:
+            content = cached_fetch(self.cache, "mpc_orbit", {"target_type": target_type, **kwargs}, span.fetcher(fetch, self.cache))
+            span["bytes"] = len(content)
+        return json.loads(content)
+
+    def _orbit_request(self):
+        # Qué consulta de órbita corresponde al objeto: (endpoint, parámetros) o None
         if self.object_exists():
             if self.object_type() == 'Cometa':
                 if self.ID_object() !=None:
-                    self.orbit_data = MPC.query_object('comet',designation=self.ID_object())[0]
+                    return "mpc_orbit", {"target_type": 'comet', "designation": self.ID_object()}
                 else:
-                    self.orbit_data = MPC.query_object('comet',designation=self.provisional_designation())[0]
+                    return "mpc_orbit", {"target_type": 'comet', "designation": self.provisional_designation()}
                     
             elif self.object_type() == 'Asteroide':
                 if self.ID_object() !=None:
-                    self.orbit_data = MPC.query_object('asteroid',number=self.ID_object())[0]
+                    return "mpc_orbit", {"target_type": 'asteroid', "number": self.ID_object()}
                 else:
-                    self.orbit_data = MPC.query_object('asteroid',designation=self.provisional_designation())[0]
+                    return "mpc_orbit", {"target_type": 'asteroid', "designation": self.provisional_designation()}
                     
             elif self.object_type() == 'Objeto Interestelar':
-                url_COBS = f'https://cobs.si/api/comet.api?des={self.ID_object()}'
-                response = requests.get(url_COBS)
-                self.orbit_data = response.json()['object']  
-            else:
-                self.orbit_data = None
-        else:
+                return "cobs_comet", {"url": f'{self.url_COBS_comet}?des={self.ID_object()}'}
+        return None
+
+    def _fetch_orbit_data(self):
+        request = self._orbit_request()
+        if request is None:
             self.orbit_data = None
+        elif request[0] == "mpc_orbit":
+            self.orbit_data = self._query_orbit(**request[1])
+        elif (orbit := self._COBS_catalog_orbit()) is not None:
+            # El catálogo de COBS ya descargado trae la órbita: no hace falta otra consulta
+            self.orbit_data = orbit
+        else:
+            url_COBS = request[1]["url"]
+
+            def fetch():
+                response = self.transport.get(url_COBS)
+                response.raise_for_status()
+                return response.content
+
+            with trace_span(self.tracer, "cobs_comet", object=self.selected_object) as span:
+                content = cached_fetch(self.cache, "cobs_comet", request[1], span.fetcher(fetch, self.cache))
+                span["bytes"] = len(content)
+            self.orbit_data = json.loads(content)['object']
 
     #---------------Periodo orbital----------------
     def orbital_period(self):
@@ -135,28 +271,42 @@ class Information:
 
     #---------------Fecha perihelio--------------
     def date_perihelion(self):
+        """
+        Fecha del perihelio como `datetime` en UTC (None si no se conoce).
+        """
         if self.object_exists():
             if self.object_type() == 'Cometa' or self.object_type() == 'Asteroide':
-                base, frac = self.orbit_data.get('perihelion_date').split(".")           # Separa fecha base y fracción
-                frac_day = float("0." + frac)         # Convierte la fracción a decimal
-                base_date = datetime.strptime(base, "%Y-%m-%d")  # Convierte fecha base
-                t = base_date + timedelta(days=frac_day) 
-                return pd.to_datetime(t).tz_localize("UTC")     # Suma la fracción de día
+                base, _, frac = self.orbit_data.get('perihelion_date').partition(".")   # Separa fecha base y fracción
+                frac_day = float("0." + (frac or "0"))         # Convierte la fracción a decimal
+                base_date = datetime.strptime(base, "%Y-%m-%d").replace(tzinfo=timezone.utc)  # Convierte fecha base
+                return base_date + timedelta(days=frac_day)     # Suma la fracción de día
             elif self.object_type() == 'Objeto Interestelar':
-                return pd.to_datetime(self.orbit_data.get('perihelion_date'), utc=True)
+                return self._parse_utc(self.orbit_data.get('perihelion_date'))
             else:
                 return None
         else:
             return None
 
+    @staticmethod
+    def _parse_utc(value):
+        # Fecha ISO de COBS ("2025-10-29 11:46:00", "...T...Z", con o sin zona) a datetime en UTC
+        t = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        return t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t.astimezone(timezone.utc)
+
     #----------------Existencia en COBS------------------
     def comet_exists_in_COBS(self,selected_object):
-        url_list_comets = 'https://cobs.si/api/comet_list.api'
-        response = requests.get(url_list_comets)
-        if response.status_code == 200:
-            content = response.json() 
-            list_comets = pl.DataFrame(content['objects'])['name']
-            if selected_object in list_comets:
-                return True
-            else:
-                return False
+        # Búsqueda en el catálogo de COBS compartido (una sola descarga por proceso)
+        return self._COBS_catalog().exists(selected_object)
+
+    def _COBS_catalog(self):
+        return get_COBS_catalog(cache=self.cache, transport=self._transport, tracer=self.tracer)
+
+    def _COBS_catalog_orbit(self):
+        # Entrada del catálogo de COBS si trae la fecha de perihelio (None si no)
+        try:
+            entry = self._COBS_catalog().get(self.ID_object())
+        except Exception:
+            return None
+        if entry is not None and entry.get('perihelion_date'):
+            return entry
+        return None
@@ -0,0 +1,45 @@
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import polars as pl
+
+#---------------Pools de procesos compartidos (uno por tamaño)----------------
+_process_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(workers):
+    """
+    Pool de procesos del tamaño indicado, compartido por todas las instancias.
+
+    Se usa el método "spawn" (procesos nuevos, sin fork) para no heredar los
+    hilos internos de Polars, que pueden bloquear a los procesos hijos.
+    """
+    with _pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _process_pools[workers] = pool
+        return pool
+
+
+def shutdown_process_pools():
+    # Cierra todos los pools (ej. al terminar un servicio de larga duración)
+    with _pools_lock:
+        for pool in _process_pools.values():
+            pool.shutdown(wait=True)
+        _process_pools.clear()
+
+
+#---------------Intercambio de tablas entre procesos (Arrow IPC)----------------
+def to_ipc(df):
+    # Tabla de Polars a bytes Arrow IPC (los buffers de las columnas se copian tal cual)
+    buffer = io.BytesIO()
+    df.write_ipc(buffer)
+    return buffer.getvalue()
+
+
+def from_ipc(content):
+    # Bytes Arrow IPC a DataFrame de Polars (sin volver a interpretar los valores)
+    return pl.read_ipc(io.BytesIO(content))
@@ -0,0 +1,325 @@
+import os
+import re
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import quote
+import polars as pl
+
+
+def default_store_dir():
+    # Directorio por defecto: variable de entorno o ~/.local/share/paq_Datos_SLC
+    env = os.environ.get("PAQ_DATOS_SLC_STORE")
+    if env:
+        return Path(env)
+    return Path.home() / ".local" / "share" / "paq_Datos_SLC"
+
+
+class ObservationStore:
+    """
+    Almacén local de observaciones y resultados de la SLC por objeto (Parquet).
+
+    Cada objeto se guarda con su designación permanente del MPC (permid) como
+    clave, separado por fuente ("MPC" o "COBS") y tipo de tabla:
+
+    - "obs": observaciones acumuladas (obsTime, magnitud, banda).
+    - "slc": filas de `datos_SLC` ya calculadas, con su obsTime.
+
+    Permite refrescar solo lo nuevo desde la última ejecución
+    (ver `DATA.datos_SLC_refresh`).
+
+    Parámetros
+    ----------
+    directory : str o Path, opcional
+        Directorio del almacén (por defecto ~/.local/share/paq_Datos_SLC).
+
+    Ejemplo
+    --------
+    >>> store = ObservationStore("/data/slc_store")
+    >>> df = DATA().datos_SLC_refresh("12P", "Cometa", store, source="COBS")
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory is not None else default_store_dir()
+        self._lock = threading.Lock()
+
+    #---------------Rutas----------------
+    def _path(self, source, key, kind):
+        # La clave se limpia para usarla como nombre de archivo (ej. "C/2023 A3")
+        safe_key = re.sub(r"[^\w.-]+", "_", str(key).strip())
+        return self.directory / source / f"{safe_key}.{kind}.parquet"
+
+    #---------------Lectura y escritura----------------
+    def load(self, source, key, kind="obs"):
+        """
+        Devuelve la tabla guardada del objeto o None si no existe.
+        """
+        path = self._path(source, key, kind)
+        if not path.exists():
+            return None
+        return pl.read_parquet(path)
+
+    def save(self, source, key, df, kind="obs"):
+        path = self._path(source, key, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: archivo temporal + reemplazo
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.write_parquet(tmp)
+        os.replace(tmp, path)
+
+    #Filas de df_new que no están en df_old (comparando todas las columnas de df_new)
+    def _anti(self, df_new, df_old):
+        if df_old is None or not df_old.shape[0]:
+            return df_new
+        return df_new.join(df_old.select(df_new.columns), on=df_new.columns, how="anti", nulls_equal=True)
+
+    def new_rows(self, source, key, df_new, kind="obs"):
+        """
+        Filas de `df_new` que todavía no están guardadas (sin escribir nada).
+        """
+        return self._anti(df_new, self.load(source, key, kind))
+
+    def append(self, source, key, df_new, kind="obs"):
+        """
+        Agrega filas a la tabla del objeto, descartando las que ya estaban
+        guardadas, y devuelve solo las filas realmente nuevas.
+        """
+        with self._lock:
+            df_old = self.load(source, key, kind)
+            if df_old is not None and df_old.shape[0]:
+                df_new = self._anti(df_new, df_old)
+                df_all = pl.concat([df_old, df_new], how="diagonal_relaxed")
+            else:
+                df_all = df_new
+            if df_new.shape[0] or df_old is None:
+                self.save(source, key, df_all.sort("obsTime"), kind)
+        return df_new
+
+    def last_obs_time(self, source, key):
+        """
+        Fecha de la observación más reciente guardada del objeto (None si no hay).
+        """
+        df = self.load(source, key, "obs")
+        if df is None or not df.shape[0]:
+            return None
+        return df["obsTime"].max()
+
+
+class EphemerisStore(ObservationStore):
+    """
+    Almacén local de efemérides diarias de Horizons por objeto (Parquet).
+
+    Guarda las filas diarias (Date, Delta, r, Fase) ya descargadas junto con los
+    intervalos de fechas que cubren. Cualquier sub-rango ya cubierto se responde
+    localmente y solo se consultan a Horizons los huecos que faltan (ver
+    `DATA.get_ephemerides`).
+
+    Parámetros
+    ----------
+    directory : str o Path, opcional
+        Directorio del almacén (por defecto ~/.local/share/paq_Datos_SLC).
+
+    Ejemplo
+    --------
+    >>> mpc = DATA(ephemerides=EphemerisStore())
+    >>> df = mpc.get_ephemerides("12P", "1950-01-01", "2024-01-01", "Cometa")
+    """
+
+    source = "Horizons"
+
+    #---------------Intervalos cubiertos----------------
+    def coverage(self, key):
+        """
+        Intervalos [start, end] (fechas, inclusivos) ya descargados del objeto.
+        """
+        df = self.load(self.source, key, "cov")
+        if df is None:
+            return []
+        return list(zip(df["start"].to_list(), df["end"].to_list()))
+
+    def missing(self, key, start_date, end_date):
+        """
+        Sub-rangos de [start_date, end_date] que todavía no están en el almacén.
+        """
+        start, end = _as_date(start_date), _as_date(end_date)
+        gaps = []
+        for cov_start, cov_end in self.coverage(key):
+            if cov_end < start:
+                continue
+            if cov_start > end:
+                break
+            if cov_start > start:
+                gaps.append((start, cov_start - timedelta(days=1)))
+            start = max(start, cov_end + timedelta(days=1))
+            if start > end:
+                return gaps
+        gaps.append((start, end))
+        return gaps
+
+    #---------------Lectura y escritura----------------
+    def add(self, key, df, start_date, end_date):
+        """
+        Guarda las efemérides descargadas para [start_date, end_date] y marca el
+        intervalo como cubierto.
+        """
+        with self._lock:
+            df_old = self.load(self.source, key, "eph")
+            if df_old is not None:
+                df = pl.concat([df_old, df], how="diagonal_relaxed")
+            self.save(self.source, key, df.unique("Date", keep="last").sort("Date"), "eph")
+
+            intervals = sorted(self.coverage(key) + [(_as_date(start_date), _as_date(end_date))])
+            merged = [intervals[0]]
+            for cov_start, cov_end in intervals[1:]:
+                # Se unen los intervalos que se solapan o son contiguos
+                if cov_start <= merged[-1][1] + timedelta(days=1):
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], cov_end))
+                else:
+                    merged.append((cov_start, cov_end))
+            self.save(self.source, key, pl.DataFrame(merged, schema={"start": pl.Date, "end": pl.Date}, orient="row"), "cov")
+
+    def query(self, key, start_date, end_date):
+        """
+        Efemérides guardadas del objeto entre start_date y end_date (inclusive).
+        """
+        df = self.load(self.source, key, "eph")
+        if df is None:
+            # Sin efemérides guardadas (ej. todos los bloques vinieron vacíos): tabla vacía
+            return pl.DataFrame(schema={"Date": pl.Datetime("us", "UTC"), "Delta": pl.Float64,
+                                        "r": pl.Float64, "Fase": pl.Float64})
+        return df.filter(pl.col("Date").dt.date().is_between(_as_date(start_date), _as_date(end_date)))
+
+
+def _as_date(value):
+    # Fecha a partir de 'YYYY-MM-DD' (se ignora la hora si la trae) o de date/datetime
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+class SLCDataset:
+    """
+    Conjunto de datos Parquet particionado con los resultados de `datos_SLC`.
+
+    Cada objeto se guarda en su propia partición estilo Hive::
+
+        <directorio>/object_type=<tipo>/family=<familia>/object=<permid>/part-0.parquet
+
+    junto con un archivo `metadata.json` (permid, T_peri, periodo, fuente y
+    fecha de descarga). `scan` lee muchos objetos de forma perezosa: los filtros
+    sobre tipo, familia u objeto descartan particiones completas y los filtros
+    sobre columnas como `Fase`, `r` o `t-Tq` se empujan a la lectura de Parquet.
+
+    Parámetros
+    ----------
+    directory : str o Path
+        Directorio raíz del conjunto de datos.
+
+    Ejemplo
+    --------
+    >>> dataset = SLCDataset("/data/slc")
+    >>> for obj, df, error in DATA().datos_SLC_many(members, "2000-01-01", "2024-01-01", dataset=dataset):
+    ...     pass
+    >>> lf = dataset.scan(family="hilda").filter(pl.col("Fase") < 5)
+    """
+
+    partitions = ("object_type", "family", "object")
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    #---------------Rutas----------------
+    def _partition_dir(self, object_type, family, permid):
+        values = (object_type, family, permid)
+        # Los valores se codifican como en Hive (ej. "C/2023 A3" -> "C%2F2023%20A3")
+        parts = [f"{name}={_hive_value(value)}" for name, value in zip(self.partitions, values)]
+        return self.directory.joinpath(*parts)
+
+    #---------------Escritura----------------
+    def write(self, df, permid, object_type, family=None, source="MPC", T_peri=None, period=None):
+        """
+        Guarda (o reemplaza) la SLC de un objeto y su archivo de metadatos.
+        """
+        directory = self._partition_dir(object_type, family, permid)
+        directory.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "permid": str(permid),
+            "object_type": object_type,
+            "family": family,
+            "source": source,
+            "T_peri": T_peri.isoformat() if hasattr(T_peri, "isoformat") else T_peri,
+            "period": float(period) if period is not None else None,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "rows": df.shape[0],
+        }
+        # Escritura atómica: archivo temporal + reemplazo
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if df.shape[0]:
+            tmp = directory / f"part-0.parquet{suffix}"
+            df.write_parquet(tmp)
+            os.replace(tmp, directory / "part-0.parquet")
+        else:
+            # Sin filas solo quedan los metadatos (una tabla vacía no tiene tipos de columna)
+            (directory / "part-0.parquet").unlink(missing_ok=True)
+        tmp = directory / f"metadata.json{suffix}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(tmp, directory / "metadata.json")
+        return directory
+
+    def write_info(self, df, info, source="MPC", key=None):
+        """
+        Igual que `write`, tomando permid, tipo, familia, T_peri y periodo de un `Information`.
+        """
+        permid = key or info.ID_object() or info.provisional_designation() or str(info.selected_object).strip()
+        return self.write(df, permid, info.object_type(), family=info.family_object(), source=source,
+                          T_peri=info.date_perihelion(), period=info.orbital_period())
+
+    #---------------Lectura----------------
+    def _files(self):
+        return sorted(self.directory.glob("*=*/*=*/*=*/part-0.parquet"))
+
+    def scan(self, object_type=None, family=None, objects=None):
+        """
+        LazyFrame con las SLC guardadas (None si el conjunto está vacío).
+
+        Las columnas object_type, family y object vienen de las particiones;
+        los filtros sobre ellas solo leen los archivos necesarios.
+        """
+        files = self._files()
+        if not files:
+            return None
+        lf = pl.scan_parquet([str(p) for p in files], hive_partitioning=True,
+                             hive_schema={name: pl.Utf8 for name in self.partitions})
+        if object_type is not None:
+            lf = lf.filter(pl.col("object_type") == object_type)
+        if family is not None:
+            lf = lf.filter(pl.col("family") == family)
+        if objects is not None:
+            lf = lf.filter(pl.col("object").is_in([str(o) for o in objects]))
+        return lf
+
+    def metadata(self):
+        """
+        Tabla con los metadatos de todos los objetos guardados.
+        """
+        rows = []
+        for path in self.directory.glob("*=*/*=*/*=*/metadata.json"):
+            with open(path, "r", encoding="utf-8") as f:
+                rows.append(json.load(f))
+        schema = {"permid": pl.Utf8, "object_type": pl.Utf8, "family": pl.Utf8, "source": pl.Utf8,
+                  "T_peri": pl.Utf8, "period": pl.Float64, "fetched_at": pl.Utf8, "rows": pl.Int64}
+        return pl.DataFrame(rows, schema=schema).with_columns(
+            pl.col("T_peri").str.to_datetime(time_zone="UTC", strict=False),
+            pl.col("fetched_at").str.to_datetime(time_zone="UTC", strict=False),
+        ).sort("permid")
+
+
+def _hive_value(value):
+    # Valor de partición; None se guarda con el valor por defecto de Hive (se lee como nulo)
+    if value is None or str(value).strip() == "":
+        return "__HIVE_DEFAULT_PARTITION__"
+    return quote(str(value).strip(), safe="")
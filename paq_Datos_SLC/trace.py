@@ -0,0 +1,135 @@
+import threading
+import time
+import polars as pl
+
+
+class Span(dict):
+    """
+    Medición de una etapa (descarga, lectura, unión...) que se entrega al tracer.
+
+    Es un diccionario con las claves:
+
+    - stage    : nombre de la etapa (ej. "mpc_download", "horizons_parse").
+    - object   : objeto consultado (si aplica).
+    - start    : instante de inicio (segundos desde epoch).
+    - seconds  : duración en segundos.
+    - bytes    : bytes de la respuesta (descargas).
+    - rows_in  : filas de entrada.
+    - rows_out : filas de salida.
+    - cache    : "hit", "miss" o None si no hay caché configurada (descargas).
+    - error    : representación del error si la etapa falló.
+    """
+
+    def __init__(self, tracer, stage, **fields):
+        super().__init__(stage=stage, **fields)
+        self._tracer = tracer
+
+    def __enter__(self):
+        self["start"] = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self["seconds"] = time.perf_counter() - self._t0
+        if exc is not None:
+            self["error"] = repr(exc)
+        self._tracer(dict(self))
+        return False
+
+    def fetcher(self, fetch, cache):
+        """
+        Envuelve la función de descarga para registrar si la respuesta vino de la caché.
+        """
+        self["cache"] = "hit" if cache is not None else None
+
+        def wrapped():
+            if cache is not None:
+                self["cache"] = "miss"
+            return fetch()
+
+        return wrapped
+
+
+class _NullSpan:
+    # Etapa sin tracer: no mide nada (costo casi nulo)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+    def fetcher(self, fetch, cache):
+        return fetch
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def trace_span(tracer, stage, **fields):
+    # Contexto que mide la etapa y la entrega a `tracer` (función que recibe un dict)
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, stage, **fields)
+
+
+class TraceSummary:
+    """
+    Tracer que acumula las etapas en memoria y resume tiempos, bytes y filas.
+
+    Se pasa como `tracer` a `DATA` (y desde ahí a `Information`); es seguro
+    usarlo desde varios hilos (ej. `datos_SLC_many`).
+
+    Ejemplo
+    --------
+    >>> summary = TraceSummary()
+    >>> mpc = DATA(tracer=summary)
+    >>> df = mpc.datos_SLC("Ceres", "2020-01-01", "2024-01-01", "Asteroide")
+    >>> print(summary.summary())
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def frame(self):
+        """
+        Todas las etapas registradas como DataFrame (una fila por etapa).
+        """
+        schema = {"stage": pl.Utf8, "object": pl.Utf8, "start": pl.Float64, "seconds": pl.Float64,
+                  "bytes": pl.Int64, "rows_in": pl.Int64, "rows_out": pl.Int64, "cache": pl.Utf8,
+                  "error": pl.Utf8}
+        with self._lock:
+            rows = [{key: span.get(key) for key in schema} for span in self.spans]
+        for row in rows:
+            if row["object"] is not None:
+                row["object"] = str(row["object"])
+        return pl.DataFrame(rows, schema=schema)
+
+    def summary(self, by="stage"):
+        """
+        Resumen por etapa (o por ["stage", "object"], etc.): llamadas, tiempo
+        total/medio/máximo, bytes, filas y aciertos/fallos de la caché.
+        """
+        return self.frame().group_by(by).agg(
+            pl.len().alias("calls"),
+            pl.col("seconds").sum().alias("total_s"),
+            pl.col("seconds").mean().alias("mean_s"),
+            pl.col("seconds").max().alias("max_s"),
+            pl.col("bytes").sum().alias("bytes"),
+            pl.col("rows_in").sum().alias("rows_in"),
+            pl.col("rows_out").sum().alias("rows_out"),
+            (pl.col("cache") == "hit").sum().alias("cache_hits"),
+            (pl.col("cache") == "miss").sum().alias("cache_misses"),
+            pl.col("error").is_not_null().sum().alias("errors"),
+        ).sort("total_s", descending=True)
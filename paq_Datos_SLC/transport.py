@@ -0,0 +1,164 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class RateLimiter:
+    """
+    Límite de consultas por segundo para cada host, compartido entre hilos.
+
+    Las consultas a un mismo host se espacian al menos 1/rate segundos.
+    """
+
+    def __init__(self, rates=None):
+        self.rates = dict(rates or {})
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host, rate):
+        with self._lock:
+            if rate is None:
+                self.rates.pop(host, None)
+            else:
+                self.rates[host] = rate
+
+    def wait(self, host):
+        with self._lock:
+            rate = self.rates.get(host)
+            if not rate:
+                return
+            # Se reserva el siguiente turno del host y se espera fuera del candado
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + 1.0 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    # Adaptador HTTP que respeta el límite por host antes de cada envío
+    def __init__(self, limiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.wait(urlsplit(request.url).hostname)
+        return super().send(request, **kwargs)
+
+
+class Transport:
+    """
+    Transporte HTTP compartido para todas las consultas a las APIs (MPC, Horizons y COBS).
+
+    Reutiliza una única `requests.Session` con un pool de conexiones persistentes
+    (keep-alive), de modo que las páginas de COBS o las consultas repetidas al MPC
+    no abren una conexión TCP+TLS nueva cada vez. Los errores transitorios
+    (conexión, 429 y 5xx) se reintentan con espera exponencial y respetando la
+    cabecera Retry-After.
+
+    Parámetros
+    ----------
+    pool_connections : int, opcional
+        Número de hosts distintos cuyo pool se mantiene abierto (por defecto 10).
+    pool_maxsize : int, opcional
+        Conexiones simultáneas máximas por host (por defecto 10).
+    timeout : float o tuple, opcional
+        Timeout por defecto (conexión, lectura) en segundos (por defecto (10, 300)).
+    retries : int, opcional
+        Número máximo de reintentos por consulta (por defecto 5).
+    backoff_factor : float, opcional
+        Factor de la espera exponencial entre reintentos: backoff_factor * 2**(n-1) s.
+    backoff_max : float, opcional
+        Espera máxima entre reintentos en segundos (por defecto 60).
+    status_forcelist : tuple, opcional
+        Códigos HTTP que se consideran transitorios y se reintentan.
+    rate_limits : dict, opcional
+        Consultas por segundo permitidas por host, ej. {"cobs.si": 2}.
+        Por defecto no hay límite.
+
+    Ejemplo
+    --------
+    >>> transport = Transport(pool_maxsize=20, retries=3)
+    >>> mpc = DATA(transport=transport)
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, timeout=(10, 300), retries=5,
+                 backoff_factor=0.5, backoff_max=60, status_forcelist=(429, 500, 502, 503, 504),
+                 rate_limits=None):
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_limits)
+
+        retry_kwargs = dict(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(["GET", "POST"]),  # Horizons se consulta con POST (idempotente)
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Tras agotar reintentos se devuelve la última respuesta
+        )
+        try:
+            retry = Retry(backoff_max=backoff_max, **retry_kwargs)
+        except TypeError:
+            # urllib3 < 2 no acepta backoff_max como parámetro
+            retry = Retry(**retry_kwargs)
+            retry.BACKOFF_MAX = backoff_max
+
+        self.adapter = _RateLimitedAdapter(self.limiter, pool_connections=pool_connections,
+                                           pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.mount(self.session)
+
+    #---------------Montar el adaptador en otra sesión (ej. astroquery)----------------
+    def mount(self, session):
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    #---------------Límite de consultas por host----------------
+    def set_rate_limit(self, host, rate):
+        # rate en consultas por segundo; None elimina el límite del host
+        self.limiter.set_rate(host, rate)
+
+    def rate_limit(self, host):
+        # Límite actual del host (None si no tiene)
+        return self.limiter.rates.get(host)
+
+    #---------------Consultas----------------
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+#---------------Transporte por defecto compartido----------------
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def default_transport():
+    # Transporte único del proceso, creado en el primer uso
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport